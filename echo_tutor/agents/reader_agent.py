@@ -1,17 +1,29 @@
-from typing import TypedDict, Annotated
-from langchain_core.messages import HumanMessage, AIMessage
+from typing import TypedDict, List, Optional
 from echo_tutor.services.modelscope_client import ModelScopeClient
-import operator
+from echo_tutor.models.session import SectionContent
+from echo_tutor.services.language import compute_profile
+from echo_tutor.services.sentence_tts import split_sentences
+from echo_tutor.config import get_settings
 
 class AgentState(TypedDict):
-    messages: Annotated[list, operator.add]
+    messages: List[str]  # short status notes, bounded by message_log_size
     file_path: str
-    extracted_text: str
     file_type: str
+    sections: List[str]
     current_section: int
     total_sections: int
+    section: Optional[SectionContent]
     user_action: str
 
+def log_message(state: AgentState, message: str) -> None:
+    """Append to the session log, keeping only the newest entries"""
+    limit = get_settings().message_log_size
+    if limit <= 0:
+        return
+    messages = state.get("messages") or []
+    messages.append(message)
+    state["messages"] = messages[-limit:]
+
 class DocumentReaderAgent:
     def __init__(self):
         self.client = ModelScopeClient()
@@ -20,6 +32,10 @@ class DocumentReaderAgent:
         """
         Process document or image to extract text
         """
+        if state.get("sections"):
+            # Already read on upload; later sections reuse the split text
+            return state
+        
         file_path = state["file_path"]
         file_type = state["file_type"]
         
@@ -28,8 +44,8 @@ class DocumentReaderAgent:
             ocr_result = await self.client.ocr_image(file_path)
             extracted_text = ocr_result["text"]
             
-            state["messages"].append(
-                AIMessage(content=f"OCR completed. Extracted {len(extracted_text)} characters.")
+            log_message(
+                state, f"OCR completed. Extracted {len(extracted_text)} characters."
             )
         else:
             # For text documents, read directly
@@ -37,25 +53,25 @@ class DocumentReaderAgent:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     extracted_text = f.read()
                 
-                state["messages"].append(
-                    AIMessage(content=f"Document read. Total {len(extracted_text)} characters.")
+                log_message(
+                    state, f"Document read. Total {len(extracted_text)} characters."
                 )
             except Exception as e:
                 extracted_text = f"Error reading file: {e}"
-                state["messages"].append(
-                    AIMessage(content=f"Error: {e}")
-                )
-        
-        state["extracted_text"] = extracted_text
+                log_message(state, f"Error: {e}")
         
         # Split into sections (simple split by paragraphs or sentences)
         sections = [s.strip() for s in extracted_text.split('\n\n') if s.strip()]
         if not sections:
-            # If no paragraphs, split by sentences
-            sections = [s.strip() for s in extracted_text.split('。') if s.strip()]
+            # If no paragraphs, split by sentences with the rules for the
+            # document's language (whole document, so not cached)
+            sections = split_sentences(
+                extracted_text, compute_profile(extracted_text).language
+            )
         if not sections:
             sections = [extracted_text]
         
+        state["sections"] = sections
         state["total_sections"] = len(sections)
         if "current_section" not in state or state["current_section"] is None:
             state["current_section"] = 0
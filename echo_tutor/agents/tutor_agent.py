@@ -1,12 +1,25 @@
-from typing import TypedDict
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from echo_tutor.services.modelscope_client import ModelScopeClient
-from echo_tutor.agents.reader_agent import AgentState
+from echo_tutor.agents.reader_agent import AgentState, log_message
+from echo_tutor.models.session import QuestionItem, SectionContent, SentenceTiming
+from echo_tutor.services.audio_store import store_audio
+from echo_tutor.services.audio_encoder import encode_audio
+from echo_tutor.services.sentence_tts import SentenceSynthesizer
+from echo_tutor.services.language import PROMPT_LANGUAGES, profile_text
 from echo_tutor.config import get_settings
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import json
-import os
 
-settings = get_settings()
+def _parse_json_response(response: str):
+    """Parse JSON from an LLM reply, tolerating markdown code fences"""
+    cleaned_response = response.strip()
+    if cleaned_response.startswith("```json"):
+        cleaned_response = cleaned_response[7:]
+    if cleaned_response.startswith("```"):
+        cleaned_response = cleaned_response[3:]
+    if cleaned_response.endswith("```"):
+        cleaned_response = cleaned_response[:-3]
+    return json.loads(cleaned_response.strip())
 
 class PronunciationTutorAgent:
     def __init__(self):
@@ -16,58 +29,73 @@ class PronunciationTutorAgent:
         """
         Generate pronunciation audio and create learning questions
         """
-        text = state["extracted_text"]
-        
-        # Split text into manageable sections
-        sections = [s.strip() for s in text.split('\n\n') if s.strip()]
-        if not sections:
-            sections = [s.strip() for s in text.split('。') if s.strip()]
-        if not sections:
-            sections = [text]
-            
+        # Sections were split once by the reader agent
+        sections = state["sections"]
         current_idx = state.get("current_section", 0)
         
         if current_idx >= len(sections):
-            state["messages"].append(
-                AIMessage(content=json.dumps({
-                    "completed": True,
-                    "message": "All sections completed!"
-                }))
-            )
+            state["section"] = SectionContent.finished(len(sections))
+            log_message(state, "All sections completed!")
             return state
         
         current_text = sections[current_idx]
         
-        # Generate TTS audio
-        language = self.client._detect_language(current_text)
-        audio_data = await self.client.text_to_speech(current_text, language)
+        # Profiled once per section; drives voice, segmentation and prompts
+        language = profile_text(current_text).language
         
-        # Save audio file
-        upload_dir = settings.upload_dir
-        os.makedirs(upload_dir, exist_ok=True)
-        audio_filename = f"audio_{current_idx}.wav"
-        audio_path = os.path.join(upload_dir, audio_filename)
-        
-        if audio_data:
-            with open(audio_path, 'wb') as f:
-                f.write(audio_data)
-        
-        # Generate learning questions using Qwen
-        questions = await self._generate_questions(current_text)
+        # Audio (TTS plus encoding) and question generation are independent
+        (audio_filename, audio_variant, sentences), questions = await asyncio.gather(
+            self._synthesize_audio(current_text, language),
+            self._generate_questions(current_text, language),
+        )
         
-        state["messages"].append(
-            AIMessage(content=json.dumps({
-                "audio_path": audio_filename,
-                "text": current_text,
-                "questions": questions,
-                "section": f"{current_idx + 1}/{len(sections)}",
-                "completed": False
-            }))
+        # Questions are parsed once here and kept as typed objects
+        state["section"] = SectionContent(
+            index=current_idx,
+            total=len(sections),
+            text=current_text,
+            audio_path=audio_filename,
+            questions=[
+                QuestionItem.from_dict(q) for q in questions if isinstance(q, dict)
+            ],
+            sentences=(
+                [SentenceTiming(**s) for s in sentences]
+                if sentences is not None
+                else None
+            ),
+            language=language,
+            audio_variant=audio_variant,
         )
+        log_message(state, f"Section {current_idx + 1}/{len(sections)} ready.")
         
         return state
     
-    async def _generate_questions(self, text: str) -> list:
+    async def _synthesize_audio(
+        self, text: str, language: str
+    ) -> Tuple[Optional[str], Optional[str], Optional[list]]:
+        """
+        Generate TTS audio and its compact variant; returns the WAV filename,
+        the variant filename and, in sentence mode, the per-sentence timings
+        """
+        sentences = None
+        audio_data = None
+        if get_settings().tts_mode == "sentence":
+            # Per-sentence audio plus a joined file with time offsets
+            result = await SentenceSynthesizer(self.client).synthesize(text, language)
+            audio_filename = result["audio_path"]
+            sentences = result["sentences"]
+        else:
+            audio_data = await self.client.text_to_speech(text, language)
+            # Save audio under a content-hashed name so its URL is immutable
+            audio_filename = store_audio(audio_data, ".wav") if audio_data else None
+        
+        audio_variant = None
+        if audio_filename:
+            # Both are offered to the client as typed <source>s
+            audio_variant = await encode_audio(audio_filename, audio_data)
+        return audio_filename, audio_variant, sentences
+    
+    async def _generate_questions(self, text: str, language: str = "zh-cn") -> list:
         """
         Use Qwen to generate comprehension questions
         """
@@ -89,6 +117,10 @@ class PronunciationTutorAgent:
   }
 ]
 """
+        # Ask in the language of the material being practised
+        system_prompt += (
+            f"\n问题、选项和解释请使用{PROMPT_LANGUAGES.get(language, '中文')}。"
+        )
 
         messages = [
             {"role": "system", "content": system_prompt},
@@ -99,17 +131,7 @@ class PronunciationTutorAgent:
             response = await self.client.chat_with_qwen(messages)
             
             # Try to parse JSON response
-            # Clean up the response if it contains markdown code blocks
-            cleaned_response = response.strip()
-            if cleaned_response.startswith("```json"):
-                cleaned_response = cleaned_response[7:]
-            if cleaned_response.startswith("```"):
-                cleaned_response = cleaned_response[3:]
-            if cleaned_response.endswith("```"):
-                cleaned_response = cleaned_response[:-3]
-            cleaned_response = cleaned_response.strip()
-            
-            questions = json.loads(cleaned_response)
+            questions = _parse_json_response(response)
             return questions
         except Exception as e:
             print(f"Question generation error: {e}")
@@ -129,20 +151,16 @@ class PronunciationTutorAgent:
                 }
             ]
     
-    async def evaluate_answer(self, state: AgentState, user_answer: str, question_id: int) -> dict:
+    async def evaluate_answer(
+        self, section: Optional[SectionContent], user_answer: str, question_id: int
+    ) -> dict:
         """
         Evaluate user's answer using Qwen
         """
-        messages = state.get("messages", [])
-        
-        # Get the question context from previous messages
-        last_message = messages[-1].content if messages else "{}"
+        questions = section.questions if section else []
         
         try:
-            question_data = json.loads(last_message)
-            questions = question_data.get("questions", [])
-            
-            if question_id >= len(questions):
+            if not 0 <= question_id < len(questions):
                 return {"is_correct": False, "explanation": "Invalid question ID"}
             
             question = questions[question_id]
@@ -155,13 +173,21 @@ class PronunciationTutorAgent:
                 },
                 {
                     "role": "user",
-                    "content": f"问题：{question['question']}\n正确答案：{question['correct_answer']}\n学生的答案：{user_answer}\n\n学生答对了吗？请提供反馈。"
+                    "content": (
+                        f"问题：{question.question}\n"
+                        f"正确答案：{question.correct_answer}\n"
+                        f"学生的答案：{user_answer}\n\n"
+                        "学生答对了吗？请提供反馈。"
+                    ),
                 }
             ]
             
             feedback = await self.client.chat_with_qwen(eval_messages)
             
-            is_correct = user_answer.lower().strip() == question['correct_answer'].lower().strip()
+            is_correct = (
+                user_answer.lower().strip()
+                == (question.correct_answer or "").lower().strip()
+            )
             
             return {
                 "is_correct": is_correct,
@@ -173,3 +199,110 @@ class PronunciationTutorAgent:
                 "is_correct": False,
                 "explanation": "评估答案时出错，请重试。"
             }
+    
+    async def evaluate_answers(
+        self, items: List[Tuple[QuestionItem, str]]
+    ) -> List[dict]:
+        """
+        Grade many (question, answer) pairs at once.
+        
+        Answers that pick one of a question's options are graded locally
+        against the stored answer and explanation. The remaining answers are
+        de-duplicated and folded into LLM calls of up to grading_batch_size
+        answers each.
+        """
+        results: List[dict] = [{}] * len(items)
+        pending: Dict[Tuple[str, Optional[str], str], List[int]] = {}
+        
+        for i, (question, answer) in enumerate(items):
+            if question.correct_answer and answer.strip() in [
+                o.strip() for o in question.options or []
+            ]:
+                results[i] = self._grade_locally(question, answer)
+            else:
+                key = (
+                    question.question,
+                    question.correct_answer,
+                    answer.strip().lower(),
+                )
+                pending.setdefault(key, []).append(i)
+        
+        groups = list(pending.values())
+        size = max(1, get_settings().grading_batch_size)
+        chunks = [groups[i:i + size] for i in range(0, len(groups), size)]
+        graded = await asyncio.gather(
+            *(
+                self._grade_with_llm([items[group[0]] for group in chunk])
+                for chunk in chunks
+            )
+        )
+        
+        for chunk, chunk_results in zip(chunks, graded):
+            for group, result in zip(chunk, chunk_results):
+                for i in group:
+                    results[i] = result
+        return results
+    
+    def _grade_locally(self, question: QuestionItem, answer: str) -> dict:
+        is_correct = (
+            answer.strip().lower() == (question.correct_answer or "").strip().lower()
+        )
+        explanation = question.explanation or ""
+        if not is_correct:
+            explanation = f"正确答案是：{question.correct_answer}。{explanation}"
+        return {"is_correct": is_correct, "explanation": explanation}
+    
+    async def _grade_with_llm(
+        self, pairs: List[Tuple[QuestionItem, str]]
+    ) -> List[dict]:
+        """
+        Grade several free-form answers with a single Qwen call
+        """
+        system_prompt = (
+            "你是一位耐心的语言导师。逐条评估学生的答案，"
+            "并为每条答案提供简短、建设性的反馈（不超过50字）。"
+        )
+        system_prompt += """
+
+请只以JSON格式返回，格式如下：
+[
+  {"id": 0, "is_correct": true, "feedback": "反馈内容"}
+]
+"""
+        lines = [
+            f"{i}. 问题：{question.question}\n"
+            f"正确答案：{question.correct_answer}\n"
+            f"学生的答案：{answer}"
+            for i, (question, answer) in enumerate(pairs)
+        ]
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "\n\n".join(lines)}
+        ]
+        
+        graded = {}
+        try:
+            response = await self.client.chat_with_qwen(messages)
+            for entry in _parse_json_response(response):
+                graded[int(entry["id"])] = entry
+        except Exception as e:
+            print(f"Batch grading error: {e}")
+        
+        results = []
+        for i, (question, answer) in enumerate(pairs):
+            entry = graded.get(i)
+            exact = (
+                answer.lower().strip()
+                == (question.correct_answer or "").lower().strip()
+            )
+            if entry is None:
+                results.append(
+                    {"is_correct": exact, "explanation": "评估答案时出错，请重试。"}
+                )
+                continue
+            is_correct = entry.get("is_correct")
+            results.append({
+                "is_correct": is_correct if isinstance(is_correct, bool) else exact,
+                "explanation": str(entry.get("feedback", ""))
+            })
+        return results
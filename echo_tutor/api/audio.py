@@ -0,0 +1,285 @@
+# Audio delivery routes
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+from echo_tutor.services.audio_store import (
+    AUDIO_EXTENSIONS,
+    digest_from_filename,
+    variant_filename,
+)
+from echo_tutor.services.audio_encoder import ENCODINGS
+from echo_tutor.config import get_settings
+from email.utils import formatdate
+from typing import Optional, Tuple
+from pathlib import Path
+import anyio
+import hashlib
+import os
+import stat
+
+router = APIRouter()
+settings = get_settings()
+
+
+class AudioFileResponse(FileResponse):
+    """
+    FileResponse that can send a byte range of the file.
+
+    Uses the ASGI zero-copy / pathsend extensions when the server offers them
+    and falls back to chunked reads otherwise.
+    """
+
+    def __init__(self, path, offset: int = 0, count: Optional[int] = None, **kwargs):
+        super().__init__(path, **kwargs)
+        self.offset = offset
+        self.count = count
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        extensions = scope.get("extensions") or {}
+        count = self.count
+        if count is None:
+            stat_result = self.stat_result
+            if stat_result is None:
+                stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            count = stat_result.st_size - self.offset
+
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in extensions:
+            with open(self.path, "rb") as file:
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": file,
+                        "offset": self.offset,
+                        "count": count,
+                        "more_body": False,
+                    }
+                )
+        elif "http.response.pathsend" in extensions and self.status_code == 200:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.offset)
+                remaining = count
+                more_body = remaining > 0
+                if not more_body:
+                    await send(
+                        {"type": "http.response.body", "body": b"", "more_body": False}
+                    )
+                while more_body:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    remaining -= len(chunk)
+                    more_body = remaining > 0 and len(chunk) > 0
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": more_body,
+                        }
+                    )
+        if self.background is not None:
+            await self.background()
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into an inclusive (start, end) pair.
+
+    Returns None for headers we choose to ignore (other units, multiple
+    ranges, malformed values) so the full file is served instead.
+    Raises a 416 for ranges that cannot be satisfied, including an empty
+    suffix range (``bytes=-0``).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, sep, end_str = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if start_str == "":
+            # Suffix range: the last N bytes
+            length = int(end_str)
+            if length < 0:
+                raise ValueError
+            if length == 0:
+                raise _range_not_satisfiable(size)
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else max(start, size - 1)
+            if start < 0 or end < start:
+                return None
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise _range_not_satisfiable(size)
+    return start, min(end, size - 1)
+
+
+def _range_not_satisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=416,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison used for If-None-Match"""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _accept_quality(media_type: str, accept: str, min_specificity: int = 0) -> float:
+    """
+    Return the q-value ``accept`` gives to ``media_type``, most specific range wins.
+
+    Matches less specific than ``min_specificity`` (0 for ``*/*``, 1 for
+    ``type/*``, 2 for the exact type) count as not accepted.
+    """
+    best: Optional[Tuple[int, float]] = None
+    for part in accept.split(","):
+        media_range, *params = [p.strip() for p in part.split(";")]
+        if media_range == media_type:
+            specificity = 2
+        elif media_range.endswith("/*") and media_type.startswith(media_range[:-1]):
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    pass
+        if best is None or specificity > best[0]:
+            best = (specificity, q)
+    return best[1] if best and best[0] >= min_specificity else 0.0
+
+
+def _negotiate(filename: str, accept: str) -> Tuple[str, bool]:
+    """
+    Pick the stored encoding of ``filename`` that best fits the Accept header.
+
+    Returns the filename to serve and whether the choice depends on Accept.
+    Only WAV URLs are negotiated. The compact variant is served only when the
+    client names its type (or ``audio/*``) with a higher q-value than WAV;
+    ``*/*`` and ties keep the WAV, since players sending ``*/*`` (e.g. Safari
+    for Ogg Opus) may not decode the variant. Browsers get the variant from
+    the typed ``audio_sources`` of a section instead.
+    """
+    if (
+        Path(filename).suffix.lower() != ".wav"
+        or not digest_from_filename(filename)
+        or settings.audio_format not in ENCODINGS
+    ):
+        return filename, False
+
+    variant = variant_filename(filename, ENCODINGS[settings.audio_format][0])
+    if not os.path.exists(os.path.join(settings.upload_dir, variant)):
+        return filename, True
+
+    variant_q = _accept_quality(
+        AUDIO_EXTENSIONS[Path(variant).suffix], accept, min_specificity=1
+    )
+    if variant_q > _accept_quality(AUDIO_EXTENSIONS[".wav"], accept):
+        return variant, True
+    return filename, True
+
+
+def _validators(filename: str, stat_result: os.stat_result) -> Tuple[str, str]:
+    """Return the ETag and Cache-Control header for an audio file"""
+    if digest_from_filename(filename):
+        # Variants share a digest, so the extension keeps their ETags distinct
+        return (
+            f'"{filename}"',
+            f"public, max-age={settings.audio_cache_max_age}, immutable",
+        )
+    # Legacy, non content-addressed names may change under the same URL
+    etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+    return f'W/"{hashlib.md5(etag_base.encode()).hexdigest()}"', "no-cache"
+
+
+@router.api_route("/{filename}", methods=["GET", "HEAD"])
+async def get_audio(filename: str, request: Request):
+    """
+    Serve a generated audio file with caching validators and Range support
+    """
+    if (
+        Path(filename).name != filename
+        or Path(filename).suffix.lower() not in AUDIO_EXTENSIONS
+    ):
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    filename, varies = _negotiate(filename, request.headers.get("accept", "*/*"))
+    ext = Path(filename).suffix.lower()
+    path = os.path.join(settings.upload_dir, filename)
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    size = stat_result.st_size
+    etag, cache_control = _validators(filename, stat_result)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+    }
+    if varies:
+        headers["Vary"] = "Accept"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # If-Range only honours a strong, exactly matching validator
+    if range_header and (
+        if_range is None or (if_range == etag and not etag.startswith("W/"))
+    ):
+        byte_range = _parse_range(range_header, size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return AudioFileResponse(
+            path,
+            media_type=AUDIO_EXTENSIONS[ext],
+            headers=headers,
+            stat_result=stat_result,
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return AudioFileResponse(
+        path,
+        offset=start,
+        count=end - start + 1,
+        status_code=206,
+        media_type=AUDIO_EXTENSIONS[ext],
+        headers=headers,
+        stat_result=stat_result,
+    )
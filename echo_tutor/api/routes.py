@@ -1,9 +1,11 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from echo_tutor.models.schemas import *
-from echo_tutor.agents.graph import create_learning_graph
-from echo_tutor.agents.tutor_agent import PronunciationTutorAgent
+from echo_tutor.services.session_store import get_session_store
 from echo_tutor.config import get_settings
+from typing import Dict, List, Optional, Tuple
 import aiofiles
+import asyncio
+import threading
 import uuid
 import os
 from pathlib import Path
@@ -11,21 +13,92 @@ from pathlib import Path
 router = APIRouter()
 settings = get_settings()
 
-# In-memory session storage (use Redis in production)
-sessions = {}
+# Sessions live in a store shared by all workers (see SESSION_BACKEND)
+session_store = get_session_store()
+
+# The compiled graph is stateless, so each worker builds it once.
+# LangGraph/LangChain are imported here rather than at module level to keep
+# worker boot fast; main.py warms this up in the background on startup.
+_graph = None
+_graph_lock = threading.Lock()
+
+def get_learning_graph():
+    global _graph
+    if _graph is None:
+        # One build per process, also when warm-up and a request race
+        with _graph_lock:
+            if _graph is None:
+                from echo_tutor.agents.graph import create_learning_graph
+                _graph = create_learning_graph()
+    return _graph
+
+async def learning_graph():
+    """
+    The graph for request handlers. Until it is built, waiting (on the
+    running warm-up, if any) happens in a thread so the event loop keeps
+    serving other requests.
+    """
+    if _graph is not None:
+        return _graph
+    return await asyncio.to_thread(get_learning_graph)
+
+def is_ready() -> bool:
+    return _graph is not None
 
 @router.post("/upload", response_model=UploadResponse)
 async def upload_file(file: UploadFile = File(...)):
     """
     Upload a document or image file
     """
-    # Validate file size
     content = await file.read()
+    return await ingest_file(file.filename or "", content)
+
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_files(files: List[UploadFile] = File(...)):
+    """
+    Upload several files at once; they are processed in parallel and share
+    the upstream concurrency limit with every other request
+    """
+    if len(files) > settings.max_batch_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.max_batch_files} files per batch",
+        )
+    
+    filenames = [file.filename or "" for file in files]
+    contents = [await file.read() for file in files]
+    outcomes = await asyncio.gather(
+        *(
+            ingest_file(filename, content)
+            for filename, content in zip(filenames, contents)
+        ),
+        return_exceptions=True,
+    )
+    
+    results = []
+    for filename, outcome in zip(filenames, outcomes):
+        if isinstance(outcome, HTTPException):
+            results.append(BatchUploadItem(filename=filename, error=outcome.detail))
+        elif isinstance(outcome, BaseException):
+            results.append(BatchUploadItem(filename=filename, error=str(outcome)))
+        else:
+            results.append(BatchUploadItem(
+                filename=filename,
+                file_id=outcome.file_id,
+                file_type=outcome.file_type
+            ))
+    return BatchUploadResponse(results=results)
+
+async def ingest_file(filename: str, content: bytes) -> UploadResponse:
+    """
+    Validate and save an uploaded file, then run it through the agent graph
+    """
+    # Validate file size
     if len(content) > settings.max_file_size:
         raise HTTPException(status_code=400, detail="File too large")
     
     # Determine file type
-    file_ext = Path(file.filename).suffix.lower()
+    file_ext = Path(filename).suffix.lower()
     if file_ext in ['.jpg', '.jpeg', '.png', '.bmp']:
         file_type = FileType.IMAGE
     elif file_ext in ['.txt', '.md']:
@@ -44,14 +117,15 @@ async def upload_file(file: UploadFile = File(...)):
         await f.write(content)
     
     # Initialize LangGraph session
-    graph = create_learning_graph()
+    graph = await learning_graph()
     initial_state = {
         "messages": [],
         "file_path": str(file_path),
         "file_type": file_type.value,
-        "extracted_text": "",
+        "sections": [],
         "current_section": 0,
         "total_sections": 0,
+        "section": None,
         "user_action": "continue"
     }
     
@@ -59,10 +133,7 @@ async def upload_file(file: UploadFile = File(...)):
     result = await graph.ainvoke(initial_state)
     
     # Store session
-    sessions[file_id] = {
-        "graph": graph,
-        "state": result
-    }
+    await session_store.set(file_id, result)
     
     return UploadResponse(
         file_id=file_id,
@@ -75,41 +146,33 @@ async def get_current_section(file_id: str):
     """
     Get the current learning section with audio and questions
     """
-    if file_id not in sessions:
+    # The tutor agent stores the current section ready to serve
+    found, section = await session_store.get_section(file_id)
+    if not found:
         raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[file_id]
-    state = session["state"]
-    
-    # Get the last message which contains the tutoring data
-    if not state["messages"]:
+    if section is None:
         raise HTTPException(status_code=400, detail="No content available")
     
-    last_message = state["messages"][-1].content
-    
-    import json
-    try:
-        data = json.loads(last_message)
-        return data
-    except:
-        return {"error": "Failed to parse session data"}
+    return section.to_response()
 
 @router.post("/session/{file_id}/answer")
 async def submit_answer(file_id: str, answer: UserAnswer):
     """
     Submit an answer to a question
     """
-    if file_id not in sessions:
+    found, section = await session_store.get_section(file_id)
+    if not found:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[file_id]
+    from echo_tutor.agents.tutor_agent import PronunciationTutorAgent
     tutor = PronunciationTutorAgent()
     
     # Evaluate answer
+    question_index = _question_index(answer.question_id)
     result = await tutor.evaluate_answer(
-        session["state"],
+        section,
         answer.answer,
-        int(answer.question_id)
+        question_index if question_index is not None else -1
     )
     
     return FeedbackResponse(
@@ -118,16 +181,83 @@ async def submit_answer(file_id: str, answer: UserAnswer):
         next_action="continue"
     )
 
+def _question_index(question_id: str) -> Optional[int]:
+    """Parse a question ID; None for anything that is not a plain index"""
+    if not question_id.isdecimal():
+        # isdigit() also accepts characters such as "²" that int() rejects
+        return None
+    return int(question_id)
+
+@router.post("/grade/batch", response_model=BatchFeedbackResponse)
+async def grade_answers(request: BatchAnswerRequest):
+    """
+    Grade many (session, question, answer) items in one request
+    """
+    if len(request.items) > settings.max_batch_answers:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.max_batch_answers} answers per batch",
+        )
+    
+    # De-duplicate identical triples and load each session once
+    keys = [
+        (item.session_id, item.question_id, item.answer.strip())
+        for item in request.items
+    ]
+    unique_keys = list(dict.fromkeys(keys))
+    session_ids = list(dict.fromkeys(key[0] for key in unique_keys))
+    sections = dict(
+        zip(
+            session_ids,
+            await asyncio.gather(
+                *(session_store.get_section(session_id) for session_id in session_ids)
+            ),
+        )
+    )
+    
+    graded: Dict[Tuple[str, str, str], dict] = {}
+    to_grade = []
+    for key in unique_keys:
+        session_id, question_id, answer = key
+        found, section = sections[session_id]
+        if not found:
+            graded[key] = {"is_correct": False, "explanation": "Session not found"}
+            continue
+        questions = section.questions if section else []
+        index = _question_index(question_id)
+        if index is None or index >= len(questions):
+            graded[key] = {"is_correct": False, "explanation": "Invalid question ID"}
+            continue
+        to_grade.append((key, questions[index], answer))
+    
+    if to_grade:
+        from echo_tutor.agents.tutor_agent import PronunciationTutorAgent
+        tutor = PronunciationTutorAgent()
+        results = await tutor.evaluate_answers(
+            [(question, answer) for _, question, answer in to_grade]
+        )
+        for (key, _, _), result in zip(to_grade, results):
+            graded[key] = result
+    
+    return BatchFeedbackResponse(results=[
+        BatchFeedbackItem(
+            session_id=key[0],
+            question_id=key[1],
+            is_correct=graded[key]["is_correct"],
+            explanation=graded[key]["explanation"]
+        )
+        for key in keys
+    ])
+
 @router.post("/session/{file_id}/next")
 async def next_section(file_id: str):
     """
     Move to the next section
     """
-    if file_id not in sessions:
+    state = await session_store.get(file_id)
+    if state is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[file_id]
-    state = session["state"]
     state["user_action"] = "next_section"
     
     # Increment section
@@ -135,10 +265,10 @@ async def next_section(file_id: str):
     state["current_section"] = current + 1
     
     # Continue the graph
-    graph = session["graph"]
+    graph = await learning_graph()
     result = await graph.ainvoke(state)
     
-    session["state"] = result
+    await session_store.set(file_id, result)
     
     return {"message": "Moved to next section"}
 
@@ -1,23 +1,54 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict
 
 class Settings(BaseSettings):
     # ModelScope
     modelscope_api_key: str = ""
     qwen_model: str = "qwen-turbo"
+    upstream_concurrency: int = 8  # in-flight DashScope requests per worker
     
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
+    workers: int = 1
+    warm_up_on_startup: bool = True  # build the agent graph before /ready passes
+    
+    # Sessions: memory (single worker) or sqlite (shared by all workers)
+    session_backend: str = "memory"
+    session_db_path: str = "./data/sessions.db"
+    message_log_size: int = 20  # status notes kept per session, 0 disables
     
     # File Upload
     max_file_size: int = 10485760  # 10MB
     upload_dir: str = "./data/uploads"
     
+    # Batch endpoints
+    max_batch_files: int = 20
+    max_batch_answers: int = 200
+    grading_batch_size: int = 20  # answers folded into one LLM grading call
+    
+    # Audio delivery
+    audio_cache_max_age: int = 31536000  # 1 year, audio URLs are content-hashed
+    audio_format: str = "wav"  # wav (no transcoding), opus or mp3; needs ffmpeg
+    audio_bitrate: str = "24k"
+    audio_encode_workers: int = 2  # ffmpeg processes running at once
+    
+    # Text-to-speech
+    tts_mode: str = "section"  # section (one request) or sentence
+    tts_concurrency: int = 4
+    # language -> voice; every qwen3-tts-flash voice speaks these languages
+    tts_voices: Dict[str, str] = {
+        "zh-cn": "Cherry",
+        "en": "Jennifer",
+        "ja": "Cherry",
+        "ko": "Cherry",
+    }
+    
     class Config:
         env_file = ".env"
 
 @lru_cache()
-def get_settings():
+def get_settings() -> Settings:
     return Settings()
@@ -0,0 +1,40 @@
+"""Gunicorn settings for multi-worker production runs.
+
+    gunicorn -c python:echo_tutor.gunicorn_conf echo_tutor.main:app
+
+The app is imported once in the master and forked into uvicorn workers,
+so modules and the compiled graph are shared copy-on-write. Use
+SESSION_BACKEND=sqlite so every worker sees every session.
+"""
+import gc
+
+from echo_tutor.config import get_settings
+
+settings = get_settings()
+
+bind = f"{settings.host}:{settings.port}"
+workers = settings.workers
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+keepalive = 5
+
+
+def when_ready(server):
+    # Build the graph in the master so workers inherit it
+    from echo_tutor.api.routes import get_learning_graph
+    get_learning_graph()
+
+    # WORKERS > 1 with the memory backend is refused when the app loads;
+    # this catches a worker count overridden on the gunicorn command line
+    if server.cfg.workers > 1 and settings.session_backend == "memory":
+        server.log.warning(
+            "SESSION_BACKEND=memory with %d workers: sessions will not be shared",
+            server.cfg.workers,
+        )
+
+
+def pre_fork(server, worker):
+    # Move everything imported so far out of the GC's reach, so collections
+    # in the workers do not touch (and copy) the pages shared with the master
+    gc.freeze()
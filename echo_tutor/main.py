@@ -1,15 +1,46 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from echo_tutor.api.routes import router
+from echo_tutor.api.routes import router, get_learning_graph, is_ready
+from echo_tutor.api.audio import router as audio_router
 from echo_tutor.config import get_settings
-import uvicorn
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import traceback
 
 settings = get_settings()
 
+def _warm_up_done(task: asyncio.Task) -> None:
+    """Report a failed warm-up so /ready can say why it is not ready"""
+    if task.cancelled():
+        return
+    e = task.exception()
+    if e is None:
+        return
+    app.state.warm_up_error = f"{type(e).__name__}: {e}"
+    print(f"Warm-up error: {e}")
+    traceback.print_exception(type(e), e, e.__traceback__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.warm_up_error = None
+    warm_up = None
+    if settings.warm_up_on_startup:
+        # Import the agent stack off the event loop so /health answers at once
+        warm_up = asyncio.create_task(asyncio.to_thread(get_learning_graph))
+        warm_up.add_done_callback(_warm_up_done)
+        app.state.warm_up = warm_up
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await warm_up
+
 app = FastAPI(
     title="Multi-Agent Learning System API",
     description="API for document/image reading with pronunciation and tutoring",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for Vue.js frontend
@@ -21,16 +52,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from fastapi.staticfiles import StaticFiles
 import os
 
 # Include routers
 app.include_router(router, prefix="/api/v1", tags=["learning"])
 
-# Mount static files for audio
-audio_dir = settings.upload_dir
-os.makedirs(audio_dir, exist_ok=True)
-app.mount("/audio", StaticFiles(directory=audio_dir), name="audio")
+# Serve generated audio with Range support and long-lived caching
+os.makedirs(settings.upload_dir, exist_ok=True)
+app.include_router(audio_router, prefix="/audio", tags=["audio"])
 
 @app.get("/")
 async def root():
@@ -42,12 +71,30 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up"""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: the agent graph is built and requests will not pay for it"""
+    if not is_ready():
+        error = getattr(app.state, "warm_up_error", None)
+        if error:
+            return JSONResponse(
+                status_code=503, content={"status": "warm_up_failed", "error": error}
+            )
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
 if __name__ == "__main__":
+    import uvicorn
+
+    # Reload only works with a single process; production uses WORKERS > 1
+    # (or gunicorn with echo_tutor.gunicorn_conf for a preloaded master)
     uvicorn.run(
         "echo_tutor.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug
+        workers=settings.workers,
+        reload=settings.debug and settings.workers == 1
     )
@@ -42,3 +42,29 @@ class FeedbackResponse(BaseModel):
     is_correct: bool
     explanation: str
     next_action: str  # "continue", "next_section", "end"
+
+class BatchUploadItem(BaseModel):
+    filename: str
+    file_id: Optional[str] = None
+    file_type: Optional[FileType] = None
+    error: Optional[str] = None
+
+class BatchUploadResponse(BaseModel):
+    results: List[BatchUploadItem]
+
+class BatchAnswerItem(BaseModel):
+    session_id: str
+    question_id: str
+    answer: str
+
+class BatchAnswerRequest(BaseModel):
+    items: List[BatchAnswerItem]
+
+class BatchFeedbackItem(BaseModel):
+    session_id: str
+    question_id: str
+    is_correct: bool
+    explanation: str
+
+class BatchFeedbackResponse(BaseModel):
+    results: List[BatchFeedbackItem]
@@ -0,0 +1,145 @@
+# Compact per-session state
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from echo_tutor.services.audio_store import audio_sources
+
+
+def _optional_str(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+@dataclass
+class QuestionItem:
+    """A generated question, parsed once when the section is built"""
+    __slots__ = ("question", "options", "correct_answer", "explanation")
+
+    question: str
+    options: Optional[List[str]]
+    correct_answer: Optional[str]
+    explanation: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuestionItem":
+        # Values come from LLM JSON, so numbers (e.g. options [3, 4, 5]) are
+        # turned into strings here rather than handled by every caller
+        options = data.get("options")
+        return cls(
+            question=str(data.get("question", "")),
+            options=[str(o) for o in options] if isinstance(options, list) else None,
+            correct_answer=_optional_str(data.get("correct_answer")),
+            explanation=_optional_str(data.get("explanation")),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "question": self.question,
+            "options": self.options,
+            "correct_answer": self.correct_answer,
+            "explanation": self.explanation,
+        }
+
+
+@dataclass
+class SentenceTiming:
+    """One sentence of a section and where it sits in the section audio"""
+    __slots__ = ("text", "audio_path", "start", "end")
+
+    text: str
+    audio_path: Optional[str]
+    start: Optional[float]
+    end: Optional[float]
+
+    def to_dict(self) -> dict:
+        return {
+            "text": self.text,
+            "audio_path": self.audio_path,
+            "start": self.start,
+            "end": self.end,
+        }
+
+
+@dataclass
+class SectionContent:
+    """
+    The section a session is currently on.
+
+    Replaces the JSON blob previously appended to the message history, so
+    /current and /answer read fields directly instead of re-parsing.
+    """
+    __slots__ = (
+        "index", "total", "text", "audio_path", "questions", "sentences",
+        "language", "audio_variant",
+    )
+
+    index: int
+    total: int
+    text: str
+    audio_path: Optional[str]
+    questions: List[QuestionItem]
+    sentences: Optional[List[SentenceTiming]]
+    language: str  # from the script profiler, computed once per section
+    audio_variant: Optional[str]  # compact encoding of audio_path, if any
+
+    @property
+    def completed(self) -> bool:
+        return self.index >= self.total
+
+    def to_response(self) -> dict:
+        if self.completed:
+            return {"completed": True, "message": "All sections completed!"}
+        return {
+            "audio_path": self.audio_path,
+            "audio_sources": audio_sources(self.audio_path, self.audio_variant),
+            "text": self.text,
+            "questions": [q.to_dict() for q in self.questions],
+            "sentences": (
+                [s.to_dict() for s in self.sentences]
+                if self.sentences is not None
+                else None
+            ),
+            "section": f"{self.index + 1}/{self.total}",
+            "language": self.language,
+            "completed": False,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "total": self.total,
+            "text": self.text,
+            "audio_path": self.audio_path,
+            "questions": [q.to_dict() for q in self.questions],
+            "sentences": (
+                [s.to_dict() for s in self.sentences]
+                if self.sentences is not None
+                else None
+            ),
+            "language": self.language,
+            "audio_variant": self.audio_variant,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SectionContent":
+        sentences = data.get("sentences")
+        return cls(
+            index=data["index"],
+            total=data["total"],
+            text=data.get("text", ""),
+            audio_path=data.get("audio_path"),
+            questions=[QuestionItem.from_dict(q) for q in data.get("questions", [])],
+            sentences=(
+                [SentenceTiming(**s) for s in sentences]
+                if sentences is not None
+                else None
+            ),
+            language=data.get("language", "zh-cn"),
+            audio_variant=data.get("audio_variant"),
+        )
+
+    @classmethod
+    def finished(cls, total: int) -> "SectionContent":
+        return cls(
+            index=total, total=total, text="", audio_path=None, questions=[],
+            sentences=None, language="en", audio_variant=None,
+        )
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import shutil
+from typing import Optional
+
+from echo_tutor.config import get_settings
+from echo_tutor.services.audio_store import digest_from_filename, store_audio
+from echo_tutor.services.limits import get_semaphore
+
+# format -> (file extension, ffmpeg codec, ffmpeg container)
+ENCODINGS = {
+    "opus": (".opus", "libopus", "ogg"),
+    "mp3": (".mp3", "libmp3lame", "mp3"),
+}
+
+
+def encoder_available() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+async def transcode(data: bytes, audio_format: str, bitrate: str) -> bytes:
+    """
+    Transcode WAV bytes to a compact speech format with ffmpeg.
+
+    ffmpeg already runs in its own process, so it is driven directly over
+    pipes; ``audio_encode_workers`` caps how many run at once.
+    """
+    _, codec, container = ENCODINGS[audio_format]
+    command = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-vn", "-ac", "1",
+        "-c:a", codec, "-b:a", bitrate,
+    ]
+    if audio_format == "opus":
+        # Tune the encoder for speech rather than music
+        command += ["-application", "voip"]
+    command += ["-f", container, "pipe:1"]
+    async with get_semaphore("audio_encode", get_settings().audio_encode_workers):
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate(input=data)
+    if process.returncode != 0:
+        message = stderr.decode(errors="replace").strip()
+        raise RuntimeError(f"ffmpeg exited with {process.returncode}: {message}")
+    return stdout
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def encode_audio(
+    wav_filename: str,
+    data: Optional[bytes] = None,
+    upload_dir: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Store a compact variant of a content-addressed WAV file.
+
+    ``data`` is the WAV content when the caller already has it; otherwise
+    the file is read off the event loop. Returns the variant filename, or
+    None when transcoding is disabled, ffmpeg is missing or encoding fails;
+    callers then keep serving the WAV.
+    """
+    settings = get_settings()
+    audio_format = settings.audio_format
+    if audio_format not in ENCODINGS:
+        return None
+    if not encoder_available():
+        print("Audio encoding skipped: ffmpeg not found")
+        return None
+
+    upload_dir = upload_dir or settings.upload_dir
+    try:
+        if data is None:
+            path = os.path.join(upload_dir, wav_filename)
+            data = await asyncio.to_thread(_read_file, path)
+        encoded = await transcode(data, audio_format, settings.audio_bitrate)
+    except Exception as e:
+        print(f"Audio encoding error: {e}")
+        return None
+
+    ext = ENCODINGS[audio_format][0]
+    return store_audio(
+        encoded, ext, upload_dir, digest=digest_from_filename(wav_filename)
+    )
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import List, Optional
+
+from echo_tutor.config import get_settings
+
+# Audio files are named after a digest of their bytes, so a URL always maps to
+# the same content and can be cached forever by browsers and CDNs.
+DIGEST_LENGTH = 32
+AUDIO_EXTENSIONS = {
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+}
+
+# <source type> values; naming the codec lets a browser skip a format it
+# cannot decode (e.g. Ogg Opus on older Safari) and fall back to the WAV
+SOURCE_TYPES = {**AUDIO_EXTENSIONS, ".opus": 'audio/ogg; codecs="opus"'}
+
+_HASHED_NAME = re.compile(r"^([0-9a-f]{%d})\.[a-z0-9]+$" % DIGEST_LENGTH)
+
+
+def content_digest(data: bytes) -> str:
+    """Return the digest used to name a piece of audio"""
+    return hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]
+
+
+def digest_from_filename(filename: str) -> Optional[str]:
+    """Return the content digest encoded in ``filename``, if it has one"""
+    match = _HASHED_NAME.match(filename)
+    return match.group(1) if match else None
+
+
+def audio_sources(wav_filename: Optional[str], variant: Optional[str]) -> List[dict]:
+    """
+    Typed sources for an ``<audio>`` element, compact variant first so the
+    browser picks it when it can play it
+    """
+    filenames = [name for name in (variant, wav_filename) if name]
+    return [
+        {"audio_path": name, "type": SOURCE_TYPES[os.path.splitext(name)[1].lower()]}
+        for name in filenames
+    ]
+
+
+def variant_filename(source_filename: str, ext: str) -> str:
+    """
+    Return the name of an encoded variant of ``source_filename``.
+
+    Variants share the digest of the source audio, so they are as immutable
+    as the source they were derived from.
+    """
+    return os.path.splitext(source_filename)[0] + ext
+
+
+def store_audio(
+    data: bytes,
+    ext: str = ".wav",
+    upload_dir: Optional[str] = None,
+    digest: Optional[str] = None,
+) -> str:
+    """
+    Save audio under a content-addressed filename and return that filename.
+
+    ``digest`` overrides the name for encoded variants of existing audio.
+    Identical audio is written only once; the file is moved into place
+    atomically so concurrent readers never see a partial file.
+    """
+    upload_dir = upload_dir or get_settings().upload_dir
+    os.makedirs(upload_dir, exist_ok=True)
+
+    filename = f"{digest or content_digest(data)}{ext}"
+    path = os.path.join(upload_dir, filename)
+    if os.path.exists(path):
+        return filename
+
+    fd, tmp_path = tempfile.mkstemp(dir=upload_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return filename
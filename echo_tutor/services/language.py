@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict
+
+# Script markers written by the translate table. Every BMP character is in
+# the table, so input letters never survive as themselves and markers cannot
+# collide with the input; unclassified characters become FILLER.
+HAN, KANA, HANGUL, LATIN = "H", "K", "G", "L"
+FILLER = "."
+
+_SCRIPT_RANGES = {
+    HAN: [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)],
+    KANA: [(0x3040, 0x30FF), (0x31F0, 0x31FF)],
+    HANGUL: [(0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)],
+    LATIN: [(0x41, 0x5A), (0x61, 0x7A), (0xC0, 0xD6), (0xD8, 0xF6), (0xF8, 0x24F)],
+}
+
+# Share of letters in CJK scripts above which a text is treated as CJK.
+# One CJK character carries roughly as much as a short Latin word, so a
+# single Chinese word in an English paragraph stays well below this.
+CJK_THRESHOLD = 0.3
+
+PROMPT_LANGUAGES = {"zh-cn": "中文", "en": "英文", "ja": "日文", "ko": "韩文"}
+
+# language_type accepted by qwen3-tts-flash; other languages are left to "Auto"
+TTS_LANGUAGES = {"zh-cn": "Chinese", "en": "English", "ja": "Japanese", "ko": "Korean"}
+
+
+def _build_script_table() -> str:
+    """
+    One character per BMP code point: the script marker for classified
+    letters and FILLER for everything else
+    """
+    table = [FILLER] * 0x10000
+    for marker, ranges in _SCRIPT_RANGES.items():
+        for start, end in ranges:
+            table[start:end + 1] = [marker] * (end + 1 - start)
+    return "".join(table)
+
+
+# Built at import, so a preloaded app shares it with every forked worker.
+# A 64K ASCII str (64 KB) rather than a dict of 65,536 int keys (about 4.7 MB);
+# translate leaves characters past the BMP unchanged (IndexError), and they
+# are counted as no script.
+_SCRIPT_TABLE = _build_script_table()
+
+
+@dataclass(frozen=True)
+class ScriptProfile:
+    """Letter counts per script for a piece of text"""
+    __slots__ = ("han", "kana", "hangul", "latin")
+
+    han: int
+    kana: int
+    hangul: int
+    latin: int
+
+    @property
+    def letters(self) -> int:
+        return self.han + self.kana + self.hangul + self.latin
+
+    @property
+    def cjk_ratio(self) -> float:
+        return (
+            (self.han + self.kana + self.hangul) / self.letters if self.letters else 0.0
+        )
+
+    @property
+    def is_cjk(self) -> bool:
+        return self.cjk_ratio >= CJK_THRESHOLD
+
+    @property
+    def is_mixed(self) -> bool:
+        """Both CJK and Latin make up a noticeable share of the text"""
+        return 0.1 <= self.cjk_ratio <= 0.9
+
+    @property
+    def language(self) -> str:
+        """Language code used to pick TTS voice, prompts and segmentation"""
+        if not self.is_cjk:
+            return "en"
+        if self.hangul > self.han + self.kana:
+            return "ko"
+        # Japanese mixes kanji with kana; Chinese has no kana at all
+        if self.kana and self.kana >= 0.1 * (self.han + self.kana):
+            return "ja"
+        return "zh-cn"
+
+    def proportions(self) -> Dict[str, float]:
+        letters = self.letters or 1
+        return {
+            "han": self.han / letters,
+            "kana": self.kana / letters,
+            "hangul": self.hangul / letters,
+            "latin": self.latin / letters,
+        }
+
+
+def compute_profile(text: str) -> ScriptProfile:
+    """
+    Count letters per script in one translate pass.
+
+    ``str.translate`` maps every classified letter to its script marker and
+    everything else (digits, punctuation, whitespace, other scripts) to
+    FILLER, so the counts run over a string of single-byte characters.
+    """
+    marked = text.translate(_SCRIPT_TABLE)
+    return ScriptProfile(
+        han=marked.count(HAN),
+        kana=marked.count(KANA),
+        hangul=marked.count(HANGUL),
+        latin=marked.count(LATIN),
+    )
+
+
+@lru_cache(maxsize=512)
+def profile_text(text: str) -> ScriptProfile:
+    """Cached ``compute_profile``; sections are profiled once and reused"""
+    return compute_profile(text)
@@ -0,0 +1,22 @@
+import asyncio
+import weakref
+from typing import Dict
+
+# Semaphores per event loop and name; asyncio primitives cannot cross loops
+_semaphores: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    """
+    Return the process-wide semaphore called ``name`` for the running loop.
+
+    ``limit`` only applies when the semaphore is first created.
+    """
+    loop = asyncio.get_running_loop()
+    per_loop = _semaphores.setdefault(loop, {})
+    semaphore = per_loop.get(name)
+    if semaphore is None:
+        semaphore = per_loop[name] = asyncio.Semaphore(limit)
+    return semaphore
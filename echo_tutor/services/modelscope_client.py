@@ -1,14 +1,27 @@
 import httpx
 from echo_tutor.config import get_settings
+from echo_tutor.services.limits import get_semaphore
+from echo_tutor.services.language import TTS_LANGUAGES, compute_profile
 import base64
 import os
 from typing import Optional
 import json
 
 class ModelScopeClient:
-    def __init__(self):
+    tts_model = "qwen3-tts-flash"
+    tts_voice = "Cherry"  # Default voice, used when TTS_VOICES has no entry
+
+    def __init__(self) -> None:
         self.settings = get_settings()
         self.api_key = self.settings.modelscope_api_key
+    
+    def _upstream(self):
+        """Shared cap on in-flight DashScope requests across all sessions"""
+        return get_semaphore("upstream", self.settings.upstream_concurrency)
+    
+    def voice_for(self, language: str) -> str:
+        """TTS voice for a language code from the script profiler"""
+        return self.settings.tts_voices.get(language, self.tts_voice)
         
     async def ocr_image(self, image_path: str) -> dict:
         """
@@ -46,7 +59,7 @@ class ModelScopeClient:
                 }
             }
             
-            async with httpx.AsyncClient() as client:
+            async with self._upstream(), httpx.AsyncClient() as client:
                 response = await client.post(url, json=payload, headers=headers, timeout=60.0)
                 response.raise_for_status()
                 result = response.json()
@@ -78,7 +91,6 @@ class ModelScopeClient:
             
         try:
             # Using qwen3-tts-flash via multimodal endpoint
-            model_name = "qwen3-tts-flash"
             url = "https://dashscope.aliyuncs.com/api/v1/services/aigc/multimodal-generation/generation"
             
             headers = {
@@ -87,19 +99,20 @@ class ModelScopeClient:
             }
             
             payload = {
-                "model": model_name,
+                "model": self.tts_model,
                 "input": {
-                    "text": text
+                    "text": text,
+                    "language_type": TTS_LANGUAGES.get(language, "Auto")
                 },
                 "parameters": {
-                    "voice": "Cherry" # Default voice
+                    "voice": self.voice_for(language)
                 }
             }
             
             if self.settings.debug:
                 print(f"TTS Request: {text[:50]}...")
                 
-            async with httpx.AsyncClient() as client:
+            async with self._upstream(), httpx.AsyncClient() as client:
                 response = await client.post(url, json=payload, headers=headers, timeout=60.0)
                 
                 if self.settings.debug:
@@ -154,7 +167,7 @@ class ModelScopeClient:
                 }
             }
             
-            async with httpx.AsyncClient() as client:
+            async with self._upstream(), httpx.AsyncClient() as client:
                 response = await client.post(url, json=payload, headers=headers, timeout=30.0)
                 response.raise_for_status()
                 result = response.json()
@@ -166,9 +179,10 @@ class ModelScopeClient:
             return "这是一个示例回答。请配置正确的 ModelScope API Key 以使用完整功能。"
     
     def _detect_language(self, text: str) -> str:
-        """Simple language detection"""
-        # Check if contains Chinese characters
-        for char in text:
-            if '\u4e00' <= char <= '\u9fff':
-                return "zh-cn"
-        return "en"
+        """
+        Language of the dominant script (zh-cn, ja, ko or en).
+
+        Used for whole OCR results, so it is not cached; sections go through
+        profile_text instead.
+        """
+        return compute_profile(text).language
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import io
+import os
+import re
+import wave
+from typing import Any, Dict, List, Optional, Tuple
+
+from echo_tutor.config import get_settings
+from echo_tutor.services.audio_store import DIGEST_LENGTH, store_audio
+from echo_tutor.services.limits import get_semaphore
+from echo_tutor.services.language import profile_text
+from echo_tutor.services.modelscope_client import ModelScopeClient
+
+# A sentence ends at CJK or ASCII terminators, plus any closing quotes.
+# A period only counts when followed by whitespace, so "3.14" stays whole.
+_SENTENCE_END = re.compile(r"(?:[。！？!?；;…]+|\.+(?=\s|$))[”’\"'』」)）]*")
+
+# English words whose trailing period does not end a sentence
+_ABBREVIATIONS = {
+    "mr",
+    "mrs",
+    "ms",
+    "dr",
+    "prof",
+    "sr",
+    "jr",
+    "st",
+    "vs",
+    "etc",
+    "e.g",
+    "i.e",
+}
+
+
+def split_sentences(text: str, language: Optional[str] = None) -> List[str]:
+    """
+    Split a section into sentences, keeping their punctuation.
+
+    ``language`` selects the rules (profiled from the text when omitted);
+    English text does not break after common abbreviations such as "Dr.".
+    """
+    if language is None:
+        language = profile_text(text).language
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+
+    # Fold punctuation-only fragments into the previous sentence
+    merged: List[str] = []
+    for sentence in sentences:
+        if merged and not any(c.isalnum() for c in sentence):
+            merged[-1] += sentence
+        elif merged and language == "en" and _ends_with_abbreviation(merged[-1]):
+            merged[-1] += " " + sentence
+        else:
+            merged.append(sentence)
+    return merged
+
+
+def _ends_with_abbreviation(sentence: str) -> bool:
+    if not sentence.endswith("."):
+        return False
+    last_word = sentence.rsplit(None, 1)[-1].rstrip(".").lower()
+    return last_word in _ABBREVIATIONS
+
+
+def tts_semaphore() -> asyncio.Semaphore:
+    """Process-wide cap on concurrent TTS requests"""
+    return get_semaphore("tts", get_settings().tts_concurrency)
+
+
+def concatenate_wav(chunks: List[bytes]) -> Optional[Tuple[bytes, List[float]]]:
+    """
+    Join WAV files that share a format.
+
+    Returns the joined WAV and the duration of each chunk in seconds, or
+    None if a chunk cannot be parsed or the formats differ.
+    """
+    params = None
+    frames = []
+    durations = []
+    try:
+        for chunk in chunks:
+            with wave.open(io.BytesIO(chunk)) as w:
+                chunk_params = (w.getnchannels(), w.getsampwidth(), w.getframerate())
+                if params is None:
+                    params = chunk_params
+                elif chunk_params != params:
+                    return None
+                n_frames = w.getnframes()
+                frames.append(w.readframes(n_frames))
+                durations.append(n_frames / w.getframerate())
+    except (wave.Error, EOFError):
+        return None
+    if params is None:
+        return None
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(params[0])
+        w.setsampwidth(params[1])
+        w.setframerate(params[2])
+        w.writeframes(b"".join(frames))
+    return buffer.getvalue(), durations
+
+
+class SentenceSynthesizer:
+    """
+    Synthesize a section sentence by sentence.
+
+    Sentences are sent to TTS concurrently, bounded by ``tts_concurrency``,
+    and each sentence's audio is cached on disk under a key derived from the
+    voice, language and text, so repeated phrases are only synthesized once.
+    """
+
+    def __init__(
+        self,
+        client: Optional[ModelScopeClient] = None,
+        upload_dir: Optional[str] = None,
+    ):
+        self.client = client or ModelScopeClient()
+        self.upload_dir = upload_dir or get_settings().upload_dir
+
+    def cache_key(self, sentence: str, language: str) -> str:
+        key = "|".join(
+            [self.client.tts_model, self.client.voice_for(language), language, sentence]
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:DIGEST_LENGTH]
+
+    async def synthesize(self, text: str, language: str) -> dict:
+        """
+        Returns ``audio_path`` (all sentences joined, or None) and
+        ``sentences``: text, audio_path and start/end offsets in seconds.
+        """
+        sentences = split_sentences(text, language)
+        # Repeated sentences share one request; the disk cache only helps
+        # once a sentence has finished synthesizing
+        unique = list(dict.fromkeys(sentences))
+        results = await asyncio.gather(
+            *(self._synthesize_sentence(sentence, language) for sentence in unique)
+        )
+        filenames = dict(zip(unique, results))
+
+        entries: List[Dict[str, Any]] = [
+            {
+                "text": sentence,
+                "audio_path": filenames[sentence],
+                "start": None,
+                "end": None,
+            }
+            for sentence in sentences
+        ]
+        voiced = [entry for entry in entries if entry["audio_path"]]
+        if not voiced:
+            return {"audio_path": None, "sentences": entries}
+
+        chunks = []
+        for entry in voiced:
+            with open(os.path.join(self.upload_dir, entry["audio_path"]), "rb") as f:
+                chunks.append(f.read())
+        joined = concatenate_wav(chunks)
+        if joined is None:
+            return {"audio_path": None, "sentences": entries}
+
+        audio_data, durations = joined
+        offset = 0.0
+        for entry, duration in zip(voiced, durations):
+            entry["start"] = round(offset, 3)
+            offset += duration
+            entry["end"] = round(offset, 3)
+
+        return {
+            "audio_path": store_audio(audio_data, ".wav", self.upload_dir),
+            "sentences": entries,
+        }
+
+    async def _synthesize_sentence(self, sentence: str, language: str) -> Optional[str]:
+        digest = self.cache_key(sentence, language)
+        filename = f"{digest}.wav"
+        if os.path.exists(os.path.join(self.upload_dir, filename)):
+            return filename
+
+        async with tts_semaphore():
+            audio_data = await self.client.text_to_speech(sentence, language)
+        if not audio_data:
+            return None
+        return store_audio(audio_data, ".wav", self.upload_dir, digest=digest)
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from echo_tutor.config import get_settings
+from echo_tutor.models.session import SectionContent
+
+
+class SessionStore(ABC):
+    """Where learning sessions live between requests"""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[dict]:
+        """Return the session state, or None for an unknown session"""
+
+    @abstractmethod
+    async def set(self, session_id: str, state: dict) -> None:
+        """Create or replace the session state"""
+
+    @abstractmethod
+    async def get_section(
+        self, session_id: str
+    ) -> Tuple[bool, Optional[SectionContent]]:
+        """
+        Return whether the session exists and its current section, without
+        loading the rest of the state (the document's sections, the log)
+        """
+
+
+class MemorySessionStore(SessionStore):
+    """Per-process dict; only valid with a single worker"""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, dict] = {}
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        return self._sessions.get(session_id)
+
+    async def set(self, session_id: str, state: dict) -> None:
+        self._sessions[session_id] = state
+
+    async def get_section(
+        self, session_id: str
+    ) -> Tuple[bool, Optional[SectionContent]]:
+        state = self._sessions.get(session_id)
+        if state is None:
+            return False, None
+        return True, state.get("section")
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Sessions in a SQLite file shared by every worker on the host.
+
+    Connections are opened lazily per thread and per process, so the store
+    is safe to create before a pre-forking server forks its workers.
+
+    The current section lives in its own table, so /current and /answer
+    parse one section instead of the whole session with every section's
+    text.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with sqlite3.connect(path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS current_sections ("
+                "id TEXT PRIMARY KEY, section TEXT)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _get(self, session_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        row = self._connection().execute(
+            "SELECT s.state, c.section FROM sessions s "
+            "LEFT JOIN current_sections c ON c.id = s.id WHERE s.id = ?",
+            (session_id,),
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _get_section(self, session_id: str) -> Optional[Tuple[Optional[str]]]:
+        row = self._connection().execute(
+            "SELECT section FROM current_sections WHERE id = ?", (session_id,)
+        ).fetchone()
+        return (row[0],) if row else None
+
+    def _set(self, session_id: str, data: str, section: Optional[str]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, state, updated_at) "
+                "VALUES (?, ?, ?)",
+                (session_id, data, time.time()),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO current_sections (id, section) VALUES (?, ?)",
+                (session_id, section),
+            )
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        row = await asyncio.to_thread(self._get, session_id)
+        return load_state(*row) if row is not None else None
+
+    async def set(self, session_id: str, state: dict) -> None:
+        await asyncio.to_thread(self._set, session_id, *dump_state(state))
+
+    async def get_section(
+        self, session_id: str
+    ) -> Tuple[bool, Optional[SectionContent]]:
+        row = await asyncio.to_thread(self._get_section, session_id)
+        if row is None:
+            # Sessions written before sections had their own table
+            state = await self.get(session_id)
+            return state is not None, state.get("section") if state else None
+        return True, load_section(row[0])
+
+
+def dump_state(state: dict) -> Tuple[str, Optional[str]]:
+    """Serialize an AgentState into the state and current-section columns"""
+    section = state.get("section")
+    rest = {key: value for key, value in state.items() if key != "section"}
+    return (
+        json.dumps(rest, ensure_ascii=False),
+        (
+            json.dumps(section.to_dict(), ensure_ascii=False)
+            if section is not None
+            else None
+        ),
+    )
+
+
+def load_section(data: Optional[str]) -> Optional[SectionContent]:
+    return SectionContent.from_dict(json.loads(data)) if data is not None else None
+
+
+def load_state(data: str, section: Optional[str] = None) -> dict:
+    state: dict = json.loads(data)
+    if section is not None:
+        state["section"] = load_section(section)
+    else:
+        # Older rows kept the section inside the state blob
+        legacy = state.get("section")
+        state["section"] = (
+            SectionContent.from_dict(legacy) if legacy is not None else None
+        )
+    return state
+
+
+@lru_cache()
+def get_session_store() -> SessionStore:
+    settings = get_settings()
+    if settings.session_backend == "sqlite":
+        return SqliteSessionStore(settings.session_db_path)
+    if settings.session_backend == "memory":
+        if settings.workers > 1:
+            # Each worker would get its own dict and lose the others' sessions
+            raise ValueError(
+                "SESSION_BACKEND=memory cannot be shared by "
+                f"WORKERS={settings.workers}; use SESSION_BACKEND=sqlite"
+            )
+        return MemorySessionStore()
+    raise ValueError(f"Unknown session backend: {settings.session_backend}")
@@ -0,0 +1,97 @@
+"""Benchmark compact TTS audio encodings.
+
+Reports bytes per second of speech and encoder CPU seconds per second of
+speech for WAV, Opus and MP3 at a few bitrates.
+
+    uv run python scripts/bench_audio_encoding.py [speech.wav]
+
+Without an argument a synthetic 24 kHz mono clip (the qwen3-tts-flash output
+format) is used. Requires ffmpeg on PATH.
+"""
+import asyncio
+import io
+import math
+import random
+import resource
+import sys
+import time
+import wave
+
+from echo_tutor.services.audio_encoder import ENCODINGS, encoder_available, transcode
+
+BITRATES = ["16k", "24k", "32k", "48k"]
+
+
+def synthetic_speech(seconds: float = 20.0, rate: int = 24000) -> bytes:
+    """Voiced harmonics with a syllable-rate envelope and pauses"""
+    rng = random.Random(0)
+    frames = bytearray()
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        pitch = 140 + 30 * math.sin(2 * math.pi * 0.7 * t)
+        envelope = max(0.0, math.sin(2 * math.pi * 4 * t)) * (
+            1 if (t % 2.5) < 2.0 else 0
+        )
+        voiced = sum(math.sin(2 * math.pi * pitch * k * t) / k for k in range(1, 6))
+        sample = envelope * (0.3 * voiced + 0.05 * rng.uniform(-1, 1))
+        frames += int(max(-1.0, min(1.0, sample)) * 32767).to_bytes(
+            2, "little", signed=True
+        )
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+def duration_of(wav_data: bytes) -> float:
+    with wave.open(io.BytesIO(wav_data)) as w:
+        return w.getnframes() / w.getframerate()
+
+
+def child_cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def bench():
+    if not encoder_available():
+        print("ffmpeg not found on PATH")
+        sys.exit(1)
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            wav_data = f.read()
+    else:
+        wav_data = synthetic_speech()
+    seconds = duration_of(wav_data)
+
+    print(f"Speech duration: {seconds:.1f}s")
+    print(
+        f"{'format':<8}{'bitrate':>8}{'bytes/s':>12}{'ratio':>8}"
+        f"{'cpu ms/s':>10}{'wall ms':>10}"
+    )
+    print(
+        f"{'wav':<8}{'-':>8}{len(wav_data) / seconds:>12.0f}{1.0:>8.1f}"
+        f"{0:>10.1f}{0:>10.1f}"
+    )
+
+    for audio_format in ENCODINGS:
+        for bitrate in BITRATES:
+            cpu_before = child_cpu_seconds()
+            start = time.perf_counter()
+            encoded = asyncio.run(transcode(wav_data, audio_format, bitrate))
+            wall = time.perf_counter() - start
+            cpu = child_cpu_seconds() - cpu_before
+            print(
+                f"{audio_format:<8}{bitrate:>8}{len(encoded) / seconds:>12.0f}"
+                f"{len(wav_data) / len(encoded):>8.1f}{cpu / seconds * 1000:>10.1f}"
+                f"{wall * 1000:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,179 @@
+"""Throughput of the batch endpoints against the per-item endpoints.
+
+Upstream DashScope calls are replaced by sleeps with a fixed latency (still
+bounded by the shared upstream limit), so the numbers show how many remote
+calls each approach makes and how well they overlap.
+
+    uv run python scripts/bench_batch.py [llm_latency_s]
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+from echo_tutor.api import routes
+from echo_tutor.main import app
+from echo_tutor.models.session import QuestionItem, SectionContent
+from echo_tutor.services.modelscope_client import ModelScopeClient
+
+LATENCY = float(sys.argv[1]) if len(sys.argv) > 1 else 0.3
+SESSIONS = 30
+ANSWERS = 300
+FILES = 20
+PER_ITEM_CONCURRENCY = 8
+
+calls = {"llm": 0}
+
+
+async def fake_chat(self, messages):
+    calls["llm"] += 1
+    async with self._upstream():
+        await asyncio.sleep(LATENCY)
+    system, prompt = messages[0]["content"], messages[-1]["content"]
+    if "逐条评估" in system:
+        count = prompt.count("学生的答案")
+        return json.dumps(
+            [{"id": i, "is_correct": True, "feedback": "很好"} for i in range(count)]
+        )
+    if "生成" in system:
+        return "[]"
+    return "很好，继续努力。"
+
+
+async def fake_tts(self, text, language="zh-cn"):
+    async with self._upstream():
+        await asyncio.sleep(LATENCY / 2)
+    return b""
+
+
+def make_answers(rng):
+    questions = [
+        QuestionItem(
+            "这段文字的主要内容是什么？",
+            ["选项A", "选项B", "选项C", "选项D"],
+            "选项A",
+            "解释",
+        ),
+        QuestionItem("请用英语翻译第一句话。", None, "Hello world", None),
+    ]
+    for i in range(SESSIONS):
+        section = SectionContent(0, 1, "text", None, questions, None, "zh-cn", None)
+        asyncio.run(routes.session_store.set(f"s{i}", {"section": section}))
+
+    answers = []
+    for _ in range(ANSWERS):
+        question_id = rng.choice(["0", "1"])
+        answer = rng.choice(["选项A", "选项B"]) if question_id == "0" else rng.choice(
+            ["Hello world", "Hello, world", "Hi world", "Hello earth"]
+        )
+        answers.append(
+            {
+                "session_id": f"s{rng.randrange(SESSIONS)}",
+                "question_id": question_id,
+                "answer": answer,
+            }
+        )
+    return answers
+
+
+async def per_item_answers(client, answers, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def submit(item):
+        async with semaphore:
+            response = await client.post(
+                f"/api/v1/session/{item['session_id']}/answer",
+                json={"question_id": item["question_id"], "answer": item["answer"]},
+            )
+            response.raise_for_status()
+
+    await asyncio.gather(*(submit(item) for item in answers))
+
+
+async def batch_answers(client, answers):
+    # Requests are capped at MAX_BATCH_ANSWERS items
+    size = routes.settings.max_batch_answers
+    for start in range(0, len(answers), size):
+        chunk = answers[start:start + size]
+        response = await client.post("/api/v1/grade/batch", json={"items": chunk})
+        response.raise_for_status()
+
+
+async def per_item_uploads(client, files, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(name, content):
+        async with semaphore:
+            response = await client.post(
+                "/api/v1/upload", files={"file": (name, content)}
+            )
+            response.raise_for_status()
+
+    await asyncio.gather(*(upload(name, content) for name, content in files))
+
+
+async def batch_uploads(client, files):
+    response = await client.post(
+        "/api/v1/upload/batch",
+        files=[("files", (name, content)) for name, content in files],
+    )
+    response.raise_for_status()
+
+
+async def timed(label, items, coro):
+    calls["llm"] = 0
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32}{elapsed:>9.2f}{items / elapsed:>10.1f}{calls['llm']:>11}")
+
+
+async def run(answers, files):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=600
+    ) as client:
+        print(f"{'scenario':<32}{'seconds':>9}{'items/s':>10}{'llm calls':>11}")
+        await timed(
+            "answers, per-item sequential",
+            len(answers),
+            per_item_answers(client, answers, 1),
+        )
+        await timed(f"answers, per-item x{PER_ITEM_CONCURRENCY}", len(answers),
+                    per_item_answers(client, answers, PER_ITEM_CONCURRENCY))
+        await timed("answers, batch", len(answers), batch_answers(client, answers))
+        await timed(
+            "uploads, per-item sequential",
+            len(files),
+            per_item_uploads(client, files, 1),
+        )
+        await timed("uploads, batch", len(files), batch_uploads(client, files))
+
+
+def bench():
+    ModelScopeClient.chat_with_qwen = fake_chat
+    ModelScopeClient.text_to_speech = fake_tts
+    routes.settings.upload_dir = tempfile.mkdtemp()
+    routes.settings.modelscope_api_key = "bench"
+
+    rng = random.Random(0)
+    answers = make_answers(rng)
+    files = [
+        (f"doc{i}.txt", f"第 {i} 篇文章。Paragraph {i}.".encode()) for i in range(FILES)
+    ]
+
+    print(
+        f"Simulated upstream latency: {LATENCY * 1000:.0f} ms, "
+        f"upstream limit: {routes.settings.upstream_concurrency}, "
+        f"CPUs: {os.cpu_count()}"
+    )
+    asyncio.run(run(answers, files))
+
+
+if __name__ == "__main__":
+    bench()
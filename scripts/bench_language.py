@@ -0,0 +1,70 @@
+"""Throughput of script profiling on megabyte-sized mixed-language input.
+
+Compares the previous detector (a Python loop that stops at the first CJK
+ideograph, so English text is scanned in full), a per-character loop that
+produces the same counts as the profiler, and the translate-table profiler.
+
+    uv run python scripts/bench_language.py [megabytes ...]
+"""
+import sys
+import time
+
+from echo_tutor.services.language import _SCRIPT_TABLE, FILLER, compute_profile
+
+CORPUS = {
+    "en": "The quick brown fox jumps over the lazy dog, then rests by the river. ",
+    "en+zh": "Today we visited 北京 and tried 烤鸭 for dinner. It was great! ",
+    "zh+en": "我们今天学习 Python 编程，重点是 asyncio 和并发。",
+    "ja": "今日は東京で日本語を勉強しました。とても楽しかったです。",
+}
+
+
+def legacy_detect(text: str) -> str:
+    for char in text:
+        if '\u4e00' <= char <= '\u9fff':
+            return "zh-cn"
+    return "en"
+
+
+def per_char_profile(text: str) -> dict:
+    counts = {}
+    for char in text:
+        code = ord(char)
+        marker = _SCRIPT_TABLE[code] if code < 0x10000 else FILLER
+        if marker != FILLER:
+            counts[marker] = counts.get(marker, 0) + 1
+    return counts
+
+
+def timed(func, text: str, rounds: int = 3) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench():
+    sizes = [float(arg) for arg in sys.argv[1:]] or [1.0, 8.0]
+
+    print(
+        f"{'corpus':<8}{'MB':>6}{'legacy MB/s':>13}{'per-char MB/s':>15}"
+        f"{'profile MB/s':>14}{'language':>10}{'legacy':>8}"
+    )
+    for size in sizes:
+        for name, sample in CORPUS.items():
+            text = sample * max(1, int(size * 1e6 / len(sample.encode())))
+            megabytes = len(text.encode()) / 1e6
+            legacy = timed(legacy_detect, text)
+            per_char = timed(per_char_profile, text)
+            profile = timed(compute_profile, text)
+            print(
+                f"{name:<8}{megabytes:>6.1f}{megabytes / legacy:>13.1f}"
+                f"{megabytes / per_char:>15.1f}{megabytes / profile:>14.1f}"
+                f"{compute_profile(text).language:>10}{legacy_detect(text):>8}"
+            )
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,126 @@
+"""Memory and lookup cost of session state for many concurrent sessions.
+
+Compares the previous layout (full document text plus an AIMessage per
+section holding a JSON blob that /current and /answer re-parse) with the
+compact SectionContent layout.
+
+    uv run python scripts/bench_session_memory.py [sessions] [sections_visited]
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+from langchain_core.messages import AIMessage
+
+from echo_tutor.models.session import QuestionItem, SectionContent
+
+PARAGRAPH = (
+    "这是一个用于测试的段落，包含一些中文内容。"
+    "The quick brown fox jumps over the lazy dog. "
+) * 6
+SECTIONS = [f"{i}. {PARAGRAPH}" for i in range(12)]
+QUESTIONS = [
+    {
+        "question": f"关于第 {i} 段的问题是什么？",
+        "options": ["选项A", "选项B", "选项C", "选项D"],
+        "correct_answer": "选项A",
+        "explanation": "根据文本内容，这是正确答案。",
+    }
+    for i in range(3)
+]
+
+
+def legacy_state(visited: int) -> dict:
+    messages = [
+        AIMessage(content=f"Document read. Total {len(PARAGRAPH) * 12} characters.")
+    ]
+    for index in range(visited):
+        # Every /next used to re-read the document and append a new blob
+        messages.append(AIMessage(content="Document read."))
+        messages.append(AIMessage(content=json.dumps({
+            "audio_path": f"audio_{index}.wav", "text": SECTIONS[index],
+            "questions": QUESTIONS, "section": f"{index + 1}/12", "completed": False,
+        })))
+    return {
+        "messages": messages, "file_path": "x.txt", "file_type": "document",
+        "extracted_text": "\n\n".join(SECTIONS), "current_section": visited - 1,
+        "total_sections": 12, "user_action": "continue",
+    }
+
+
+def compact_state(visited: int) -> dict:
+    index = visited - 1
+    # Split per session like the reader agent does, so strings are not shared
+    sections = "\n\n".join(SECTIONS).split("\n\n")
+    return {
+        "messages": [f"Section {i + 1}/12 ready." for i in range(visited)][-20:],
+        "file_path": "x.txt",
+        "file_type": "document",
+        "sections": sections,
+        "current_section": index,
+        "total_sections": 12,
+        "section": SectionContent(
+            index=index,
+            total=12,
+            text=sections[index],
+            audio_path="a.wav",
+            questions=[
+                QuestionItem.from_dict(q) for q in json.loads(json.dumps(QUESTIONS))
+            ],
+            sentences=None,
+            language="en",
+            audio_variant=None,
+        ),
+        "user_action": "continue",
+    }
+
+
+def measure(build, sessions: int, visited: int):
+    tracemalloc.start()
+    store = {f"s{i}": build(visited) for i in range(sessions)}
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return store, size
+
+
+def legacy_lookup(state: dict):
+    data = json.loads(state["messages"][-1].content)
+    return data, data["questions"][1]["correct_answer"]
+
+
+def compact_lookup(state: dict):
+    section = state["section"]
+    return section.to_response(), section.questions[1].correct_answer
+
+
+def time_lookups(store: dict, lookup, rounds: int = 3) -> float:
+    states = list(store.values())
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for state in states:
+            lookup(state)
+    return (time.perf_counter() - start) / (rounds * len(states)) * 1e6
+
+
+def bench():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    visited = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    print(f"{sessions} sessions, {visited} sections visited each")
+    print(f"{'layout':<10}{'total MB':>10}{'KB/session':>12}{'lookup us':>11}")
+    for name, build, lookup in (
+        ("legacy", legacy_state, legacy_lookup),
+        ("compact", compact_state, compact_lookup),
+    ):
+        store, size = measure(build, sessions, visited)
+        per_lookup = time_lookups(store, lookup)
+        print(
+            f"{name:<10}{size / 1e6:>10.1f}{size / sessions / 1e3:>12.2f}"
+            f"{per_lookup:>11.2f}"
+        )
+        del store
+
+
+if __name__ == "__main__":
+    bench()
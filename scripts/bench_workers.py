@@ -0,0 +1,212 @@
+"""Load test: request throughput versus number of workers.
+
+Seeds sessions into a shared SQLite session store, then starts the API with
+1, 2, 4 ... workers and measures two CPU-bound paths, with TTS and the LLM
+stubbed out so nothing waits on the upstream APIs:
+
+- current: GET /session/{id}/current (session load and serialization)
+- upload:  POST /upload of a multi-paragraph document (file handling, reading,
+  splitting, language profiling, graph run and session write)
+
+Each worker count runs under uvicorn --workers (each worker imports the app
+itself) and, when gunicorn is installed, under echo_tutor.gunicorn_conf
+(app preloaded in the master, gc.freeze before fork). Any worker can serve
+any session, so no sticky routing is used.
+
+    uv run python scripts/bench_workers.py [max_workers] [seconds]
+
+The load generator runs on the same host, so leave spare cores for it.
+"""
+import asyncio
+import importlib.util
+import io
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+import httpx
+from echo_tutor.models.session import QuestionItem, SectionContent
+from echo_tutor.services.session_store import SqliteSessionStore
+
+SESSIONS = 200
+CLIENT_CONNECTIONS = 16
+SAMPLE = "这是一个用于压力测试的段落。The quick brown fox jumps over the lazy dog. "
+PARAGRAPH = SAMPLE * 8
+DOCUMENT = "\n\n".join(f"{i}. {PARAGRAPH}" for i in range(30)).encode()
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _silent_wav() -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(24000)
+        w.writeframes(b"\x00\x00" * 2400)
+    return buffer.getvalue()
+
+
+def stubbed_app():
+    """App factory used by the servers: upstream calls answer immediately"""
+    from echo_tutor.main import app
+    from echo_tutor.services.modelscope_client import ModelScopeClient
+
+    wav = _silent_wav()
+
+    async def text_to_speech(self, text, language="zh-cn"):
+        return wav
+
+    async def chat_with_qwen(self, messages):
+        return (
+            '[{"question": "问题", "options": ["A", "B", "C"], '
+            '"correct_answer": "A", "explanation": "解释"}]'
+        )
+
+    ModelScopeClient.text_to_speech = text_to_speech
+    ModelScopeClient.chat_with_qwen = chat_with_qwen
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed_sessions(db_path: str) -> list:
+    store = SqliteSessionStore(db_path)
+    text = SAMPLE * 40
+    questions = [
+        {
+            "question": f"问题 {i}",
+            "options": ["选项A", "选项B", "选项C", "选项D"],
+            "correct_answer": "选项A",
+            "explanation": "解释" * 50,
+        }
+        for i in range(3)
+    ]
+    ids = []
+    for i in range(SESSIONS):
+        session_id = f"bench-{i}"
+        section = SectionContent(
+            index=0, total=1, text=text, audio_path=None,
+            questions=[QuestionItem.from_dict(q) for q in questions], sentences=None,
+            language="zh-cn", audio_variant=None,
+        )
+        state = {
+            "messages": ["Document read."], "file_path": "", "file_type": "document",
+            "sections": [text], "current_section": 0, "total_sections": 1,
+            "section": section, "user_action": "continue",
+        }
+        asyncio.run(store.set(session_id, state))
+        ids.append(session_id)
+    return ids
+
+
+def client_worker(args) -> int:
+    base_url, scenario, ids, deadline = args
+    rng = random.Random(os.getpid())
+    done = 0
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        while time.time() < deadline:
+            if scenario == "upload":
+                files = {"file": ("bench.txt", DOCUMENT, "text/plain")}
+                response = client.post("/api/v1/upload", files=files)
+            else:
+                response = client.get(f"/api/v1/session/{rng.choice(ids)}/current")
+            response.raise_for_status()
+            done += 1
+    return done
+
+
+def run_server(server: str, workers: int, env: dict):
+    port = free_port()
+    env = {**env, "WORKERS": str(workers), "PORT": str(port), "HOST": "127.0.0.1"}
+    if server == "gunicorn":
+        command = [
+            sys.executable, "-m", "gunicorn", "-c", "python:echo_tutor.gunicorn_conf",
+            "--log-level", "warning", "bench_workers:stubbed_app()",
+        ]
+    else:
+        command = [
+            sys.executable, "-m", "uvicorn", "bench_workers:stubbed_app", "--factory",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ]
+    process = subprocess.Popen(command, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        try:
+            if httpx.get(f"{base_url}/ready").status_code == 200:
+                return process, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{server} did not start")
+
+
+def measure(base_url: str, scenario: str, ids: list, seconds: float) -> float:
+    deadline = time.time() + seconds
+    args = [(base_url, scenario, ids, deadline)] * CLIENT_CONNECTIONS
+    with multiprocessing.Pool(CLIENT_CONNECTIONS) as pool:
+        return sum(pool.map(client_worker, args)) / seconds
+
+
+def bench():
+    default_workers = min(4, os.cpu_count() or 1)
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else default_workers
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, "sessions.db")
+    ids = seed_sessions(db_path)
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [SCRIPTS_DIR, os.environ.get("PYTHONPATH")])
+        ),
+        "SESSION_BACKEND": "sqlite",
+        "SESSION_DB_PATH": db_path,
+        "UPLOAD_DIR": os.path.join(tmp, "uploads"),
+        "AUDIO_FORMAT": "wav",
+        "DEBUG": "False",
+    }
+    servers = ["uvicorn"]
+    if importlib.util.find_spec("gunicorn"):
+        servers.append("gunicorn")
+    else:
+        print("gunicorn not installed (uv sync --extra prod); skipping preloaded runs")
+
+    print(f"CPUs: {os.cpu_count()}, client connections: {CLIENT_CONNECTIONS}, "
+          f"{seconds:.0f}s per run")
+    print(f"{'server':<10}{'scenario':<10}{'workers':>8}{'req/s':>10}"
+          f"{'speedup':>10}{'efficiency':>12}")
+    for server in servers:
+        baselines: dict = {}
+        workers = 1
+        while workers <= max_workers:
+            process, base_url = run_server(server, workers, env)
+            try:
+                rates = {
+                    scenario: measure(base_url, scenario, ids, seconds)
+                    for scenario in ("current", "upload")
+                }
+            finally:
+                process.terminate()
+                process.wait()
+            for scenario, rate in rates.items():
+                baseline = baselines.setdefault(scenario, rate)
+                speedup = rate / baseline
+                print(f"{server:<10}{scenario:<10}{workers:>8}{rate:>10.1f}"
+                      f"{speedup:>10.2f}{speedup / workers:>12.0%}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,185 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from echo_tutor.api import audio
+from echo_tutor.services import audio_encoder
+from echo_tutor.services.audio_store import (
+    store_audio,
+    content_digest,
+    variant_filename,
+)
+
+AUDIO = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio.settings, "upload_dir", str(tmp_path))
+    app = FastAPI()
+    app.include_router(audio.router, prefix="/audio")
+    return TestClient(app)
+
+
+@pytest.fixture
+def filename(tmp_path):
+    return store_audio(AUDIO, ".wav", str(tmp_path))
+
+
+def test_store_audio_is_content_addressed(tmp_path, filename):
+    assert filename == f"{content_digest(AUDIO)}.wav"
+    assert store_audio(AUDIO, ".wav", str(tmp_path)) == filename
+    assert (tmp_path / filename).read_bytes() == AUDIO
+
+
+def test_full_response_headers(client, filename):
+    response = client.get(f"/audio/{filename}")
+    assert response.status_code == 200
+    assert response.content == AUDIO
+    assert response.headers["etag"] == f'"{filename}"'
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"] == "audio/wav"
+
+
+def test_not_modified(client, filename):
+    etag = client.get(f"/audio/{filename}").headers["etag"]
+    response = client.get(f"/audio/{filename}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.parametrize(
+    "range_header, start, end",
+    [
+        ("bytes=0-99", 0, 99),
+        ("bytes=10000-", 10000, len(AUDIO) - 1),
+        ("bytes=-24", len(AUDIO) - 24, len(AUDIO) - 1),
+        ("bytes=100-999999", 100, len(AUDIO) - 1),
+    ],
+)
+def test_partial_content(client, filename, range_header, start, end):
+    response = client.get(f"/audio/{filename}", headers={"Range": range_header})
+    assert response.status_code == 206
+    assert response.content == AUDIO[start : end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(AUDIO)}"
+    assert response.headers["content-length"] == str(end - start + 1)
+
+
+@pytest.mark.parametrize("range_header", [f"bytes={len(AUDIO)}-", "bytes=-0"])
+def test_range_not_satisfiable(client, filename, range_header):
+    response = client.get(f"/audio/{filename}", headers={"Range": range_header})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(AUDIO)}"
+
+
+def test_if_range_mismatch_returns_full_body(client, filename):
+    response = client.get(
+        f"/audio/{filename}",
+        headers={"Range": "bytes=0-9", "If-Range": '"stale"'},
+    )
+    assert response.status_code == 200
+    assert response.content == AUDIO
+
+
+def test_rejects_non_audio_files(client, tmp_path):
+    (tmp_path / "notes.txt").write_text("secret")
+    assert client.get("/audio/notes.txt").status_code == 404
+    assert client.get("/audio/missing.wav").status_code == 404
+
+
+@pytest.fixture
+def opus_variant(tmp_path, filename, monkeypatch):
+    monkeypatch.setattr(audio.settings, "audio_format", "opus")
+    variant = variant_filename(filename, ".opus")
+    (tmp_path / variant).write_bytes(b"OggS-compact")
+    return variant
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("*/*", AUDIO),
+        ("audio/ogg, audio/wav", AUDIO),
+        ("audio/ogg, audio/wav;q=0.5", b"OggS-compact"),
+        ("audio/*, audio/wav;q=0.8", b"OggS-compact"),
+        ("audio/ogg;q=0.9, */*", AUDIO),
+        ("audio/wav", AUDIO),
+        ("audio/*;q=0.9, audio/wav", AUDIO),
+    ],
+)
+def test_negotiates_compact_variant(client, filename, opus_variant, accept, expected):
+    response = client.get(f"/audio/{filename}", headers={"Accept": accept})
+    assert response.status_code == 200
+    assert response.content == expected
+    assert response.headers["vary"] == "Accept"
+    if expected != AUDIO:
+        assert response.headers["content-type"] == "audio/ogg"
+        assert response.headers["etag"] == f'"{opus_variant}"'
+
+
+FIREFOX_MEDIA_ACCEPT = (
+    "audio/webm,audio/ogg,audio/wav,audio/*;q=0.9,"
+    "application/ogg;q=0.7,video/*;q=0.6,*/*;q=0.5"
+)
+
+
+@pytest.mark.parametrize("accept", [FIREFOX_MEDIA_ACCEPT, "*/*"])
+def test_browser_gets_variant_from_its_source(client, filename, opus_variant, accept):
+    # Browsers choose between <source> elements; each URL serves one encoding
+    assert client.get(f"/audio/{filename}", headers={"Accept": accept}).content == AUDIO
+    response = client.get(f"/audio/{opus_variant}", headers={"Accept": accept})
+    assert response.status_code == 200
+    assert response.content == b"OggS-compact"
+    assert response.headers["content-type"] == "audio/ogg"
+
+
+def test_falls_back_to_wav_without_variant(client, filename, monkeypatch):
+    monkeypatch.setattr(audio.settings, "audio_format", "mp3")
+    response = client.get(f"/audio/{filename}")
+    assert response.content == AUDIO
+    assert response.headers["vary"] == "Accept"
+
+
+async def test_encode_audio_skipped_without_ffmpeg(tmp_path, filename, monkeypatch):
+    monkeypatch.setattr(audio_encoder.get_settings(), "audio_format", "opus")
+    monkeypatch.setattr(audio_encoder.shutil, "which", lambda name: None)
+    assert await audio_encoder.encode_audio(filename, upload_dir=str(tmp_path)) is None
+
+
+async def test_encoding_overlaps_question_generation(tmp_path, monkeypatch):
+    from echo_tutor.agents import tutor_agent
+
+    monkeypatch.setattr(tutor_agent.get_settings(), "upload_dir", str(tmp_path))
+    monkeypatch.setattr(tutor_agent.get_settings(), "tts_mode", "section")
+    questions_started = asyncio.Event()
+
+    async def text_to_speech(self, text, language="zh-cn"):
+        return AUDIO
+
+    async def encode(filename, data=None):
+        # Only finishes if question generation runs alongside it
+        await asyncio.wait_for(questions_started.wait(), timeout=1)
+        assert data == AUDIO
+        return variant_filename(filename, ".opus")
+
+    async def generate_questions(self, text, language="zh-cn"):
+        questions_started.set()
+        return [{"question": "Q?", "correct_answer": "A"}]
+
+    monkeypatch.setattr(tutor_agent.ModelScopeClient, "text_to_speech", text_to_speech)
+    monkeypatch.setattr(tutor_agent, "encode_audio", encode)
+    monkeypatch.setattr(
+        tutor_agent.PronunciationTutorAgent, "_generate_questions", generate_questions
+    )
+
+    state = {"sections": ["Hello there."], "current_section": 0, "messages": []}
+    state = await tutor_agent.PronunciationTutorAgent().provide_pronunciation(state)
+    digest = content_digest(AUDIO)
+    assert state["section"].audio_path == f"{digest}.wav"
+    assert state["section"].questions[0].question == "Q?"
+    assert state["section"].to_response()["audio_sources"] == [
+        {"audio_path": f"{digest}.opus", "type": 'audio/ogg; codecs="opus"'},
+        {"audio_path": f"{digest}.wav", "type": "audio/wav"},
+    ]
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from echo_tutor.main import app
+from echo_tutor.api import routes
+from echo_tutor.agents.tutor_agent import PronunciationTutorAgent
+from echo_tutor.models.session import QuestionItem, SectionContent
+from echo_tutor.services.modelscope_client import ModelScopeClient
+from echo_tutor.services.session_store import MemorySessionStore
+
+CHOICE = QuestionItem("Pick one", ["A", "B"], "A", "A is right.")
+OPEN = QuestionItem("Translate 你好", None, "hello", None)
+
+
+class FakeChat:
+    """Stands in for chat_with_qwen and grades by exact match"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, messages):
+        prompt = messages[-1]["content"]
+        self.calls.append(prompt)
+        if "学生的答案" not in prompt:
+            return "[]"
+        entries = []
+        for block in prompt.split("\n\n"):
+            lines = block.split("\n")
+            index = int(lines[0].split(".")[0])
+            expected = lines[1].split("：", 1)[1]
+            answer = lines[2].split("：", 1)[1]
+            entries.append(
+                {
+                    "id": index,
+                    "is_correct": answer == expected,
+                    "feedback": f"graded {answer}",
+                }
+            )
+        return json.dumps(entries, ensure_ascii=False)
+
+
+@pytest.fixture
+def chat(monkeypatch):
+    fake = FakeChat()
+
+    async def chat_with_qwen(self, messages):
+        return await fake(messages)
+
+    monkeypatch.setattr(ModelScopeClient, "chat_with_qwen", chat_with_qwen)
+    return fake
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, chat):
+    store = MemorySessionStore()
+    monkeypatch.setattr(routes, "session_store", store)
+    monkeypatch.setattr(routes.settings, "upload_dir", str(tmp_path))
+    monkeypatch.setattr(routes.settings, "modelscope_api_key", "")
+    return TestClient(app)
+
+
+async def test_evaluate_answers_grades_choices_locally(chat, monkeypatch):
+    monkeypatch.setattr(routes.settings, "grading_batch_size", 2)
+    items = [
+        (CHOICE, "A"),
+        (CHOICE, "B"),
+        (OPEN, "hello"),
+        (OPEN, "Hello "),
+        (OPEN, "hi"),
+        (OPEN, "hey"),
+    ]
+    results = await PronunciationTutorAgent().evaluate_answers(items)
+
+    assert results[0] == {"is_correct": True, "explanation": "A is right."}
+    assert results[1]["is_correct"] is False
+    assert results[1]["explanation"].startswith("正确答案是：A")
+    assert [r["is_correct"] for r in results[2:]] == [True, True, False, False]
+    # "hello" and "Hello " are one answer; three unique answers, two per call
+    assert len(chat.calls) == 2
+
+
+def test_grade_batch_endpoint(client, chat):
+    section = SectionContent(0, 1, "text", None, [CHOICE, OPEN], None, "en", None)
+    asyncio.run(routes.session_store.set("s1", {"section": section}))
+
+    items = [
+        {"session_id": "s1", "question_id": "0", "answer": "A"},
+        {"session_id": "s1", "question_id": "1", "answer": "hello"},
+        {"session_id": "s1", "question_id": "1", "answer": "hello"},
+        {"session_id": "s1", "question_id": "7", "answer": "A"},
+        {"session_id": "missing", "question_id": "0", "answer": "A"},
+        {"session_id": "s1", "question_id": "²", "answer": "A"},
+    ]
+    response = client.post("/api/v1/grade/batch", json={"items": items})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [r["session_id"] for r in results] == [
+        "s1",
+        "s1",
+        "s1",
+        "s1",
+        "missing",
+        "s1",
+    ]
+    assert [r["is_correct"] for r in results] == [True, True, True, False, False, False]
+    assert results[3]["explanation"] == "Invalid question ID"
+    assert results[4]["explanation"] == "Session not found"
+    assert results[5]["explanation"] == "Invalid question ID"
+    assert len(chat.calls) == 1
+
+
+def test_grade_batch_rejects_oversized_requests(client, monkeypatch):
+    monkeypatch.setattr(routes.settings, "max_batch_answers", 2)
+    items = [{"session_id": "s1", "question_id": "0", "answer": "A"}] * 3
+    response = client.post("/api/v1/grade/batch", json={"items": items})
+    assert response.status_code == 400
+
+
+async def test_numeric_options_from_llm_are_graded(chat):
+    question = QuestionItem.from_dict(
+        {"question": "2 + 2?", "options": [3, 4, 5], "correct_answer": 4}
+    )
+    assert question.options == ["3", "4", "5"]
+    results = await PronunciationTutorAgent().evaluate_answers(
+        [(question, "4"), (question, "5")]
+    )
+    assert [r["is_correct"] for r in results] == [True, False]
+    assert chat.calls == []
+
+
+def test_upload_batch_reports_each_file(client):
+    files = [
+        ("files", ("one.txt", b"First paragraph.", "text/plain")),
+        ("files", ("two.md", b"Second paragraph.", "text/plain")),
+        ("files", ("bad.exe", b"nope", "application/octet-stream")),
+    ]
+    response = client.post("/api/v1/upload/batch", files=files)
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [r["filename"] for r in results] == ["one.txt", "two.md", "bad.exe"]
+    assert results[0]["file_id"] and results[1]["file_id"]
+    assert results[2]["error"] == "Unsupported file type"
+    current = client.get(f"/api/v1/session/{results[1]['file_id']}/current").json()
+    assert current["text"] == "Second paragraph."
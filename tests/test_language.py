@@ -0,0 +1,101 @@
+import httpx
+import pytest
+from echo_tutor.services.language import _SCRIPT_TABLE, compute_profile, profile_text
+from echo_tutor.services.modelscope_client import ModelScopeClient
+
+
+@pytest.mark.parametrize(
+    "text, language",
+    [
+        ("I really love visiting 北京 in the autumn.", "en"),
+        ("我们今天学习Python编程和machine learning。", "zh-cn"),
+        ("今日は東京で日本語を勉強しました。", "ja"),
+        ("東京タワー", "ja"),
+        ("오늘은 한국어를 공부했어요. Seoul is nice.", "ko"),
+        ("天気", "zh-cn"),
+        ("", "en"),
+        ("12345 !?。、", "en"),
+        ("Ça va très bien, naïve café.", "en"),
+    ],
+)
+def test_language(text, language):
+    assert compute_profile(text).language == language
+
+
+def test_counts_ignore_punctuation_and_other_scripts():
+    profile = compute_profile("Hi, 你好！ 😀 Привет 123")
+    assert (profile.han, profile.kana, profile.hangul, profile.latin) == (2, 0, 0, 2)
+    assert profile.is_mixed
+    assert sum(profile.proportions().values()) == pytest.approx(1.0)
+    assert compute_profile("").proportions() == {
+        "han": 0.0,
+        "kana": 0.0,
+        "hangul": 0.0,
+        "latin": 0.0,
+    }
+
+
+def test_large_mixed_corpus_matches_per_char_count():
+    chunk = "Section one 第一节 は です 한국 — 42.\n"
+    text = chunk * 5000
+    profile = compute_profile(text)
+    assert profile.han == 3 * 5000
+    assert profile.kana == 3 * 5000
+    assert profile.hangul == 2 * 5000
+    assert profile.latin == len("Sectionone") * 5000
+
+
+def test_script_table_is_a_compact_string():
+    assert isinstance(_SCRIPT_TABLE, str)
+    assert len(_SCRIPT_TABLE) == 0x10000
+    assert _SCRIPT_TABLE.isascii()
+    # Characters past the BMP are not in the table and count as no script
+    assert compute_profile("𠀀😀").letters == 0
+
+
+def test_profile_is_cached_per_section():
+    profile_text.cache_clear()
+    profile_text("同一个段落。")
+    profile_text("同一个段落。")
+    assert profile_text.cache_info().hits == 1
+
+
+def test_client_routes_voice_and_language(monkeypatch):
+    client = ModelScopeClient()
+    monkeypatch.setattr(client.settings, "tts_voices", {"en": "Ethan"})
+    assert (
+        client._detect_language("Read this short English sentence about 上海.") == "en"
+    )
+    assert client._detect_language("这是一段中文。") == "zh-cn"
+    assert client.voice_for("en") == "Ethan"
+    assert client.voice_for("ja") == client.tts_voice
+
+
+def test_ocr_language_detection_bypasses_section_cache():
+    profile_text.cache_clear()
+    ModelScopeClient()._detect_language("一整页识别出来的文字。" * 100)
+    assert profile_text.cache_info().currsize == 0
+
+
+def test_default_voice_map_routes_every_language():
+    client = ModelScopeClient()
+    assert client.voice_for("en") == "Jennifer"
+    assert client.voice_for("zh-cn") == "Cherry"
+    assert {"zh-cn", "en", "ja", "ko"} <= set(client.settings.tts_voices)
+
+
+async def test_tts_request_carries_language(monkeypatch):
+    payloads = []
+
+    async def post(self, url, json=None, **kwargs):
+        payloads.append(json)
+        return httpx.Response(500, text="stubbed")
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", post)
+    client = ModelScopeClient()
+    client.api_key = "test"
+    assert await client.text_to_speech("Hello there.", "en") == b""
+    assert await client.text_to_speech("안녕하세요.", "ko") == b""
+    assert payloads[0]["input"]["language_type"] == "English"
+    assert payloads[0]["parameters"]["voice"] == "Jennifer"
+    assert payloads[1]["input"]["language_type"] == "Korean"
@@ -0,0 +1,113 @@
+import asyncio
+import io
+import wave
+import pytest
+from echo_tutor.services import limits, sentence_tts
+from echo_tutor.services.sentence_tts import (
+    SentenceSynthesizer,
+    concatenate_wav,
+    split_sentences,
+)
+
+
+def make_wav(seconds: float, rate: int = 8000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buffer.getvalue()
+
+
+class FakeTTSClient:
+    tts_model = "fake-tts"
+    tts_voice = "fake"
+
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def voice_for(self, language: str) -> str:
+        return self.tts_voice
+
+    async def text_to_speech(self, text: str, language: str = "zh-cn") -> bytes:
+        self.calls.append(text)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        # Duration proportional to length keeps offsets easy to check
+        return make_wav(len(text) / 10)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Hello there. How are you? Fine!", ["Hello there.", "How are you?", "Fine!"]),
+        (
+            "今天天气很好。我们去公园吧！好吗？",
+            ["今天天气很好。", "我们去公园吧！", "好吗？"],
+        ),
+        ("Pi is 3.14 exactly. Right", ["Pi is 3.14 exactly.", "Right"]),
+        ("他说：“走吧。”然后离开了。", ["他说：“走吧。”", "然后离开了。"]),
+        ("Wait... what?!", ["Wait...", "what?!"]),
+        ("No terminator", ["No terminator"]),
+        (
+            "Dr. Smith arrived, e.g. today. He left.",
+            ["Dr. Smith arrived, e.g. today.", "He left."],
+        ),
+    ],
+)
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_concatenate_rejects_mismatched_formats():
+    assert concatenate_wav([make_wav(0.1, 8000), make_wav(0.1, 16000)]) is None
+    assert concatenate_wav([b"not a wav"]) is None
+
+
+async def test_synthesize_offsets_and_cache(tmp_path):
+    client = FakeTTSClient()
+    synthesizer = SentenceSynthesizer(client, str(tmp_path))
+
+    result = await synthesizer.synthesize("One two three. Four five six seven.", "en")
+    sentences = result["sentences"]
+    assert [s["text"] for s in sentences] == ["One two three.", "Four five six seven."]
+    assert sentences[0]["start"] == 0.0
+    assert sentences[0]["end"] == pytest.approx(1.4)
+    assert sentences[1]["start"] == sentences[0]["end"]
+    assert sentences[1]["end"] == pytest.approx(1.4 + 2.0)
+
+    with wave.open(str(tmp_path / result["audio_path"])) as w:
+        assert w.getnframes() / w.getframerate() == pytest.approx(3.4)
+
+    # A repeated sentence in another section is served from the cache
+    await synthesizer.synthesize("Four five six seven. Eight.", "en")
+    assert client.calls == ["One two three.", "Four five six seven.", "Eight."]
+
+
+async def test_synthesize_respects_concurrency_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(sentence_tts.get_settings(), "tts_concurrency", 2)
+    monkeypatch.setattr(limits, "_semaphores", limits.weakref.WeakKeyDictionary())
+    client = FakeTTSClient()
+    text = " ".join(f"Sentence number {i}." for i in range(8))
+
+    result = await SentenceSynthesizer(client, str(tmp_path)).synthesize(text, "en")
+    assert len(result["sentences"]) == 8
+    assert client.max_in_flight == 2
+
+
+async def test_repeated_sentences_are_synthesized_once(tmp_path):
+    client = FakeTTSClient()
+    result = await SentenceSynthesizer(client, str(tmp_path)).synthesize(
+        "Yes. No. Yes. Yes.", "en"
+    )
+
+    assert sorted(client.calls) == ["No.", "Yes."]
+    sentences = result["sentences"]
+    assert [s["text"] for s in sentences] == ["Yes.", "No.", "Yes.", "Yes."]
+    assert sentences[0]["audio_path"] == sentences[3]["audio_path"]
+    assert sentences[3]["end"] == pytest.approx(1.5)
@@ -0,0 +1,146 @@
+import json
+import sqlite3
+import pytest
+from echo_tutor.config import get_settings
+from echo_tutor.models.session import QuestionItem, SectionContent, SentenceTiming
+from echo_tutor.services.session_store import (
+    MemorySessionStore,
+    SessionStore,
+    SqliteSessionStore,
+    get_session_store,
+)
+
+
+def make_state():
+    section = SectionContent(
+        index=0,
+        total=1,
+        text="你好。",
+        audio_path="a.wav",
+        questions=[QuestionItem("问题", ["A", "B"], "A", "解释")],
+        sentences=[SentenceTiming("你好。", "b.wav", 0.0, 0.8)],
+        language="zh-cn",
+        audio_variant="a.opus",
+    )
+    return {
+        "messages": ["Document read. Total 3 characters."],
+        "file_path": "data/uploads/x.txt",
+        "file_type": "document",
+        "sections": ["你好。"],
+        "current_section": 0,
+        "total_sections": 1,
+        "section": section,
+        "user_action": "continue",
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore()
+    return SqliteSessionStore(str(tmp_path / "sessions.db"))
+
+
+async def test_round_trip(store):
+    assert await store.get("missing") is None
+    await store.set("s1", make_state())
+    state = await store.get("s1")
+    assert state["sections"] == ["你好。"]
+    assert state["section"] == make_state()["section"]
+    assert state["section"].questions[0].correct_answer == "A"
+
+
+async def test_get_section(store):
+    assert await store.get_section("missing") == (False, None)
+    await store.set("s1", make_state())
+    assert await store.get_section("s1") == (True, make_state()["section"])
+
+    await store.set("s2", {**make_state(), "section": None})
+    assert await store.get_section("s2") == (True, None)
+
+
+async def test_sqlite_section_read_skips_session_state(tmp_path):
+    store = SqliteSessionStore(str(tmp_path / "sessions.db"))
+    await store.set("s1", make_state())
+    conn = sqlite3.connect(store.path)
+    with conn:
+        # Anything outside the section table must not be parsed
+        conn.execute("UPDATE sessions SET state = 'not json' WHERE id = 's1'")
+    conn.close()
+    assert (await store.get_section("s1"))[1] == make_state()["section"]
+
+
+async def test_sqlite_reads_sessions_with_inline_section(tmp_path):
+    store = SqliteSessionStore(str(tmp_path / "sessions.db"))
+    state = make_state()
+    legacy = json.dumps(
+        {**state, "section": state["section"].to_dict()}, ensure_ascii=False
+    )
+    conn = sqlite3.connect(store.path)
+    with conn:
+        conn.execute(
+            "INSERT INTO sessions (id, state, updated_at) VALUES ('old', ?, 0)",
+            (legacy,),
+        )
+    conn.close()
+    assert (await store.get("old"))["section"] == state["section"]
+    assert await store.get_section("old") == (True, state["section"])
+
+
+async def test_sqlite_sessions_are_shared_between_workers(tmp_path):
+    # Two store instances on one file stand in for two worker processes
+    path = str(tmp_path / "sessions.db")
+    worker_a, worker_b = SqliteSessionStore(path), SqliteSessionStore(path)
+
+    await worker_a.set("s1", make_state())
+    state = await worker_b.get("s1")
+    state["current_section"] = 1
+    await worker_b.set("s1", state)
+
+    assert (await worker_a.get("s1"))["current_section"] == 1
+
+
+def test_section_response():
+    response = make_state()["section"].to_response()
+    assert response == {
+        "audio_path": "a.wav",
+        "audio_sources": [
+            {"audio_path": "a.opus", "type": 'audio/ogg; codecs="opus"'},
+            {"audio_path": "a.wav", "type": "audio/wav"},
+        ],
+        "text": "你好。",
+        "questions": [
+            {
+                "question": "问题",
+                "options": ["A", "B"],
+                "correct_answer": "A",
+                "explanation": "解释",
+            }
+        ],
+        "sentences": [
+            {"text": "你好。", "audio_path": "b.wav", "start": 0.0, "end": 0.8}
+        ],
+        "section": "1/1",
+        "language": "zh-cn",
+        "completed": False,
+    }
+    assert SectionContent.finished(1).to_response() == {
+        "completed": True,
+        "message": "All sections completed!",
+    }
+
+
+def test_memory_backend_refuses_multiple_workers(monkeypatch):
+    monkeypatch.setattr(get_settings(), "workers", 2)
+    monkeypatch.setattr(get_settings(), "session_backend", "memory")
+    get_session_store.cache_clear()
+    try:
+        with pytest.raises(ValueError, match="SESSION_BACKEND=sqlite"):
+            get_session_store()
+    finally:
+        get_session_store.cache_clear()
+
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
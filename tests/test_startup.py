@@ -0,0 +1,118 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from fastapi.testclient import TestClient
+from echo_tutor import main
+from echo_tutor.api import routes
+
+# Import time echo_tutor.main may add on top of FastAPI itself, in ms
+IMPORT_BUDGET_MS = float(os.environ.get("ECHO_TUTOR_IMPORT_BUDGET_MS", "100"))
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time per module, in ms, from ``python -X importtime``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.setdefault(name.strip(), int(cumulative) / 1000)
+    return times
+
+
+def test_import_does_not_load_agent_stack():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, echo_tutor.main; "
+            "print(sorted(m for m in sys.modules "
+            "if m.startswith(('langgraph', 'langchain'))))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_import_time_budget():
+    times = import_times("echo_tutor.main")
+    own_cost = times["echo_tutor.main"] - times["fastapi"]
+    assert (
+        own_cost < IMPORT_BUDGET_MS
+    ), f"echo_tutor.main adds {own_cost:.0f}ms over FastAPI"
+
+
+def test_ready_waits_for_graph(monkeypatch):
+    monkeypatch.setattr(main.settings, "warm_up_on_startup", False)
+    monkeypatch.setattr(routes, "_graph", None)
+    with TestClient(main.app) as client:
+        assert client.get("/health").status_code == 200
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"status": "warming_up"}
+
+        routes.get_learning_graph()
+        assert client.get("/ready").json() == {"status": "ready"}
+
+
+def test_failed_warm_up_is_reported(monkeypatch, capsys):
+    def broken_graph():
+        raise RuntimeError("graph exploded")
+
+    monkeypatch.setattr(main.settings, "warm_up_on_startup", True)
+    monkeypatch.setattr(main, "get_learning_graph", broken_graph)
+    monkeypatch.setattr(routes, "_graph", None)
+    with TestClient(main.app) as client:
+        for _ in range(100):
+            if client.get("/ready").json()["status"] != "warming_up":
+                break
+            time.sleep(0.01)
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {
+            "status": "warm_up_failed",
+            "error": "RuntimeError: graph exploded",
+        }
+    assert "Warm-up error: graph exploded" in capsys.readouterr().out
+
+
+async def test_requests_wait_for_running_warm_up(monkeypatch):
+    from echo_tutor.agents import graph
+
+    builds = []
+
+    def slow_graph():
+        time.sleep(0.3)
+        builds.append(1)
+        return object()
+
+    monkeypatch.setattr(graph, "create_learning_graph", slow_graph)
+    monkeypatch.setattr(routes, "_graph", None)
+    warm_up = asyncio.create_task(asyncio.to_thread(routes.get_learning_graph))
+    await asyncio.sleep(0.05)
+
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while not warm_up.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    first, second, _ = await asyncio.gather(
+        routes.learning_graph(), routes.learning_graph(), heartbeat()
+    )
+    assert first is second is await warm_up
+    assert builds == [1]
+    # The event loop kept running while the graph was being built
+    assert ticks > 5